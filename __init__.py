@@ -5,14 +5,45 @@ Miscellaneous python utilities.
 .. packageauthor:: Dave Zimmelman <zimmed@zimmed.io>
 
 Exports:
+    :module benchmarks -- Benchmark suite (`python -m core.benchmarks`).
+    :module codegen -- Schema-compiled controller classes.
+    :module columnar -- Memory-mapped columnar store for analytics.
     :module datamodel -- Data model/controller structures.
     :module decorators -- Core decorators module.
     :module dotdict -- Dot-notation dictionary data-structures.
     :module enum -- Enum data structure.
     :module exceptions -- Custom Exception classes.
+    :module index -- Secondary indexes over controllers.
+    :module instrument -- Hot-path counters and latency histograms.
+    :module persist -- Write-behind persistence queue.
+    :module store -- Reference in-memory and SQLite data stores.
+
+Submodules are imported lazily on first attribute access (`core.enum`), so
+`import core` stays cheap and heavy dependencies are only loaded by the
+modules that need them.
 
 """
 
+from importlib import import_module
+import sys
+from types import ModuleType
+
+
+__all__ = ('codegen', 'columnar', 'datamodel', 'decorators', 'dotdict',
+           'enum', 'exceptions', 'index', 'instrument', 'persist', 'store')
+
+# Lazily importable, but left out of `__all__` so that `from core import *`
+#   does not load the benchmark suite.
+_SUBMODULES = __all__ + ('benchmarks',)
+
+
+class _LazyPackage(ModuleType):
+    """Package module that imports submodules on first attribute access."""
+    def __getattr__(self, name):
+        if name in _SUBMODULES:
+            return import_module(self.__name__ + '.' + name)
+        raise AttributeError("'module' object has no attribute '%s'" % name)
+
 
 # ----------------------------------------------------------------------------
 __version__ = 1.04
@@ -23,3 +54,12 @@ Copyright (c) 2015 David Zimmelman - Re-use code freely with credit to
 original author(s).
 '''
 # ----------------------------------------------------------------------------
+
+
+# Swap in the lazy package last, once every module global is defined.
+_package = _LazyPackage(__name__, __doc__)
+_package.__dict__.update(globals())
+# Keep the original module alive; Python 2 clears a module's globals when it
+#   is garbage collected, and `_LazyPackage` was defined in them.
+_package._module = sys.modules[__name__]
+sys.modules[__name__] = _package
@@ -0,0 +1,52 @@
+"""Benchmark suite.
+
+Reproducible micro-benchmarks for the `datamodel`, `dotdict`, `enum` and
+`index` hot paths (and the decorators they rely on), with machine-readable
+(JSON) output and a comparison mode against a saved baseline.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Usage (from the directory containing the `core` package):
+    python -m core.benchmarks -o baseline.json
+    python -m core.benchmarks -b baseline.json -t 0.1 # exit 1 on regression
+    python -m core.benchmarks -f dotdict. -f enum.
+
+Exports:
+    :module harness -- Registry, timing harness and baseline comparison.
+    :module generators -- Synthetic controller and data generators.
+    :data MODULES -- Benchmark modules loaded by `discover`.
+    :callable discover -- Import all benchmark modules (registering their
+        benchmarks).
+"""
+
+from importlib import import_module
+
+
+MODULES = (
+    'bench_codegen',
+    'bench_columnar',
+    'bench_datamodel',
+    'bench_decorators',
+    'bench_dotdict',
+    'bench_enum',
+    'bench_index',
+    'bench_instrument',
+    'bench_persist',
+    'bench_startup',
+    'bench_store',
+)
+
+
+def discover():
+    """Import all benchmark modules.
+
+    :return: list -- Names of modules that failed to import, paired with
+        the error, e.g. when an optional dependency is missing.
+    """
+    failed = []
+    for name in MODULES:
+        try:
+            import_module(__name__ + '.' + name)
+        except ImportError as e:
+            failed.append((name, e))
+    return failed
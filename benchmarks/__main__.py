@@ -0,0 +1,68 @@
+"""Benchmark command line entry point.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+import argparse
+import sys
+
+from core.benchmarks import discover, harness
+
+
+def _format(result):
+    if result['metric'] == 'bytes':
+        return '%12d B' % result['best']
+    best = result['best']
+    for unit, scale in (('s ', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if best >= scale:
+            return '%10.3f %s' % (best / scale, unit)
+    return '%10.3f ns' % (best / 1e-9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m core.benchmarks')
+    parser.add_argument('-f', '--filter', action='append',
+                        help='Only run benchmarks containing this substring. '
+                             'May be repeated.')
+    parser.add_argument('-o', '--output', help='Write JSON results here.')
+    parser.add_argument('-b', '--baseline',
+                        help='Compare against saved JSON results; exit 1 on '
+                             'regression.')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.1,
+                        help='Allowed relative regression (default 0.1).')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-m', '--min-time', type=float, default=0.05,
+                        help='Minimum seconds per timed batch.')
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='List benchmark names and exit.')
+    args = parser.parse_args(argv)
+
+    for name, error in discover():
+        sys.stderr.write('skipping %s: %s\n' % (name, error))
+    if args.list:
+        for bench in harness.REGISTRY:
+            print(bench.name)
+        return 0
+
+    def report(name, result):
+        print('%-48s %s' % (name, _format(result)))
+        sys.stdout.flush()
+
+    results = harness.run(args.filter, args.repeat, args.min_time, report)
+    for name, error in sorted(results['skipped'].items()):
+        sys.stderr.write('skipping %s: %s\n' % (name, error))
+    if args.output:
+        harness.save(results, args.output)
+    if args.baseline:
+        regressions = harness.compare(results, harness.load(args.baseline),
+                                      args.tolerance)
+        for name, before, after, ratio in regressions:
+            print('REGRESSION %-37s %.3g -> %.3g (x%.2f)' % (
+                name, before, after, ratio))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Compiled (`compiled_controller`) versus interpreted controller updates.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+from core.benchmarks.generators import (controller_class,
+                                        derived_controller_class)
+from core.benchmarks.harness import benchmark
+from core.codegen import compiled_controller
+
+
+def _setattr(factory, compiled):
+    def setup():
+        cls = factory()
+        if compiled:
+            cls = compiled_controller(cls)
+        ctrl = cls.new()
+        return lambda: setattr(ctrl, 'a0', 1)
+    return setup
+
+
+for _name, _factory in (
+        ('keys4.fanout1', lambda: controller_class(4, 1)),
+        ('keys32.fanout1', lambda: controller_class(32, 1)),
+        ('keys4.fanout8', lambda: controller_class(4, 8)),
+        ('derived.chain10', lambda: derived_controller_class(10))):
+    benchmark('codegen.setattr.%s.interpreted' % _name)(
+        _setattr(_factory, False))
+    benchmark('codegen.setattr.%s.compiled' % _name)(
+        _setattr(_factory, True))
+
+
+@benchmark('codegen.compile.keys32.fanout8')
+def _():
+    return lambda: compiled_controller(controller_class(32, 8))
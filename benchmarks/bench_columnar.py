@@ -0,0 +1,87 @@
+"""`ColumnarStore` benchmarks: column scans and aggregations versus
+rehydrating every saved model.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+from core.benchmarks.harness import benchmark
+from core.columnar import ColumnarStore, ColumnarWriter
+from core.datamodel import DataModel, DataModelController
+from core.decorators import classproperty
+
+
+COUNT = 2000
+
+
+class Sale(DataModelController):
+    """Controller with fixed-width and string keys."""
+
+    @classproperty
+    def MODEL_RULES(cls):
+        rules = DataModelController.MODEL_RULES
+        rules['price'] = ('price', float, None)
+        rules['quantity'] = ('quantity', int, None)
+        rules['customer'] = ('customer', str, None)
+        return rules
+
+
+_cache = {}
+
+
+def _records():
+    """Saved model data and a columnar store holding the same models."""
+    if not _cache:
+        directory = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, directory, True)
+        records = [{'_collection': 'Sale', 'uid': str(i),
+                    'price': i * 0.25, 'quantity': i % 7,
+                    'customer': 'customer%d' % (i % 100)}
+                   for i in range(COUNT)]
+        path = os.path.join(directory, 'sales')
+        with ColumnarWriter(path, Sale) as writer:
+            writer.extend(DataModel(Sale.MODEL_RULES, data=record)
+                          for record in records)
+        _cache['records'] = records
+        _cache['store'] = ColumnarStore(path, Sale)
+    return _cache['records'], _cache['store']
+
+
+@benchmark('columnar.sum.rehydrate%d' % COUNT)
+def _():
+    records, store = _records()
+    rules = Sale.MODEL_RULES
+    return lambda: sum(DataModel(rules, data=record)['price']
+                       for record in records)
+
+
+@benchmark('columnar.sum.column%d' % COUNT)
+def _():
+    records, store = _records()
+    return lambda: store.column('price').sum()
+
+
+@benchmark('columnar.where.rehydrate%d' % COUNT)
+def _():
+    records, store = _records()
+    rules = Sale.MODEL_RULES
+    return lambda: [i for i, record in enumerate(records)
+                    if DataModel(rules, data=record)['customer'] ==
+                    'customer42']
+
+
+@benchmark('columnar.where.column%d' % COUNT)
+def _():
+    records, store = _records()
+    return lambda: store.column('customer').where(
+        lambda value: value == 'customer42')
+
+
+@benchmark('columnar.load')
+def _():
+    records, store = _records()
+    return lambda: store.load(COUNT // 2)
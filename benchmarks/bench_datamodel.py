@@ -0,0 +1,157 @@
+"""`DataModel` / `DataModelController` benchmarks.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+from core.benchmarks.generators import (controller_class,
+                                        derived_controller_class,
+                                        nested_controller_classes,
+                                        nested_tree)
+from core.benchmarks.harness import benchmark, memory_benchmark
+from core.datamodel import DataModel
+
+
+def _setattr(n_keys, fanout):
+    def setup():
+        ctrl = controller_class(n_keys, fanout).new()
+        return lambda: setattr(ctrl, 'a0', 1)
+    return setup
+
+
+for _n_keys, _fanout in ((4, 1), (32, 1), (4, 8), (32, 8)):
+    benchmark('datamodel.setattr.keys%d.fanout%d' % (_n_keys, _fanout))(
+        _setattr(_n_keys, _fanout))
+
+
+def _collection_full(kind, size):
+    def setup():
+        ctrl = controller_class(1, 1, kind, int).new()
+        ctrl.items = (list(range(size)) if kind == 'list' else
+                      dict(('k%d' % i, i) for i in range(size)))
+        return lambda: ctrl._update_model('items')
+    return setup
+
+
+def _collection_instruction(kind, size):
+    def setup():
+        ctrl = controller_class(1, 1, kind, int).new()
+        if kind == 'list':
+            ctrl.items = list(range(size))
+            add, remove = {'action': 'append'}, {'action': 'remove',
+                                                 'index': size}
+
+            def step():
+                ctrl.items.append(size)
+                ctrl._update_model_collection('items', add)
+                ctrl.items.pop()
+                ctrl._update_model_collection('items', remove)
+        else:
+            ctrl.items = dict(('k%d' % i, i) for i in range(size))
+            add, remove = ({'action': 'add', 'key': 'new'},
+                           {'action': 'remove', 'key': 'new'})
+
+            def step():
+                ctrl.items['new'] = size
+                ctrl._update_model_collection('items', add)
+                del ctrl.items['new']
+                ctrl._update_model_collection('items', remove)
+        return step
+    return setup
+
+
+for _kind in ('list', 'dict'):
+    for _size in (10, 1000):
+        benchmark('datamodel.collection.full.%s%d' % (_kind, _size))(
+            _collection_full(_kind, _size))
+        benchmark('datamodel.collection.instruction.%s%d' % (_kind, _size))(
+            _collection_instruction(_kind, _size))
+
+
+def _listeners(count):
+    def setup():
+        ctrl = controller_class(1, 1).new()
+        for _ in range(count):
+            ctrl.on_change('k0_0', lambda model, key, instruction: None)
+        return lambda: ctrl._call_listener('k0_0')
+    return setup
+
+
+for _count in (1, 10):
+    benchmark('datamodel.listener.dispatch%d' % _count)(_listeners(_count))
+
+
+def _derived(depth, width, attr='a0', rebound=False):
+    def setup():
+        ctrl = derived_controller_class(depth, width, rebound).new()
+        return lambda: setattr(ctrl, attr, 1)
+    return setup
+
+
+for _depth in (1, 10, 50):
+    benchmark('datamodel.derived.chain%d' % _depth)(_derived(_depth, 1))
+    benchmark('datamodel.derived.rebound%d' % _depth)(
+        _derived(_depth, 1, rebound=True))
+benchmark('datamodel.derived.chain10.width5')(_derived(10, 5))
+benchmark('datamodel.derived.chain50.unaffected')(_derived(50, 1, 'a1'))
+
+
+@benchmark('datamodel.new.keys8.fanout2')
+def _():
+    cls = controller_class(8, 2)
+    return cls.new
+
+
+@benchmark('datamodel.nested.new.depth3.width10')
+def _():
+    classes = nested_controller_classes(3)
+
+    def build():
+        return classes[0].new(children=[
+            classes[1].new(children=[classes[2].new() for _ in range(10)])
+            for _ in range(10)])
+    return build
+
+
+def _nested_change(size, propagate):
+    def setup():
+        parent_cls, child_cls = nested_controller_classes(2)
+        children = [child_cls.new() for _ in range(size)]
+        parent = parent_cls.new(children=children)
+        child = children[size // 2]
+        if propagate:
+            return lambda: setattr(child, 'a0', 1)
+
+        # How a child change had to reach the parent before linking.
+        def rebuild():
+            parent._update_model('children')
+        return rebuild
+    return setup
+
+
+for _size in (10, 1000):
+    benchmark('datamodel.nested.propagate.list%d' % _size)(
+        _nested_change(_size, True))
+    benchmark('datamodel.nested.rebuild.list%d' % _size)(
+        _nested_change(_size, False))
+
+
+@benchmark('datamodel.nested.propagate.depth3.width10')
+def _():
+    root = nested_tree(3, 10)
+    leaf = root.children[5].children[5]
+    return lambda: setattr(leaf, 'a0', 1)
+
+
+@benchmark('datamodel.load.roundtrip.keys8')
+def _():
+    model = controller_class(8, 1).new().model
+    data = dict(model.iteritems())
+    # Imports `bson` and `dill` now, so that the harness skips this
+    #   benchmark when they are missing.
+    DataModel.load(model.bson_rules, data)
+    return lambda: DataModel.load(model.bson_rules, data)
+
+
+@memory_benchmark('datamodel.memory.tree.depth3.width10')
+def _():
+    return nested_tree(3, 10)
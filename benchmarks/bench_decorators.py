@@ -0,0 +1,72 @@
+"""Decorator benchmarks.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+from core.benchmarks.generators import names
+from core.benchmarks.harness import benchmark
+from core.decorators import (abstract_class, cached_classproperty,
+                             classproperty)
+
+
+def _rules():
+    # Shaped like a typical MODEL_RULES override.
+    return dict((name, (name, int, None)) for name in names(16))
+
+
+class _Owner(object):
+    VALUE = _rules()
+
+    # noinspection PyMethodParameters,PyPep8Naming
+    @classproperty
+    def PROPERTY(cls):
+        return _rules()
+
+    # noinspection PyMethodParameters,PyPep8Naming
+    @cached_classproperty
+    def CACHED(cls):
+        return _rules()
+
+
+class _Child(_Owner):
+    pass
+
+
+@benchmark('decorators.baseline.class_attribute')
+def _():
+    return lambda: _Child.VALUE
+
+
+@benchmark('decorators.classproperty')
+def _():
+    return lambda: _Child.PROPERTY
+
+
+@benchmark('decorators.cached_classproperty')
+def _():
+    return lambda: _Child.CACHED
+
+
+class _Plain(object):
+    def __init__(self, value=None):
+        self.value = value
+
+
+@abstract_class
+class _Abstract(object):
+    def __init__(self, value=None):
+        self.value = value
+
+
+class _Concrete(_Abstract):
+    pass
+
+
+@benchmark('decorators.baseline.construct')
+def _():
+    return lambda: _Plain(1)
+
+
+@benchmark('decorators.abstract_class.construct_subclass')
+def _():
+    return lambda: _Concrete(1)
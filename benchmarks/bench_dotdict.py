@@ -0,0 +1,118 @@
+"""`DotDict` / `ImmutableDotDict` benchmarks.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+try:
+    from types import SimpleNamespace
+except ImportError:
+    from argparse import Namespace as SimpleNamespace
+
+from core.benchmarks.generators import nested_dict
+from core.benchmarks.harness import benchmark, memory_benchmark
+from core.dotdict import (DotDict, DotDictView, FrozenDotDict,
+                          ImmutableDotDict, RecursiveDotDict)
+
+
+@benchmark('dotdict.getattr.hit')
+def _():
+    d = DotDict(alpha=1, beta=2)
+    return lambda: d.alpha
+
+
+@benchmark('dotdict.getattr.miss')
+def _():
+    d = DotDict(alpha=1)
+    return lambda: getattr(d, 'missing', None)
+
+
+@benchmark('dotdict.setattr.existing')
+def _():
+    d = DotDict(alpha=1)
+    return lambda: setattr(d, 'alpha', 2)
+
+
+@benchmark('dotdict.setattr.new')
+def _():
+    d = DotDict()
+
+    def step():
+        d.alpha = 1
+        del d.alpha
+    return step
+
+
+@benchmark('dotdict.getitem')
+def _():
+    d = DotDict(alpha=1)
+    return lambda: d['alpha']
+
+
+@benchmark('dotdict.baseline.dict.getitem')
+def _():
+    d = dict(alpha=1)
+    return lambda: d['alpha']
+
+
+@benchmark('dotdict.baseline.namespace.getattr')
+def _():
+    ns = SimpleNamespace(alpha=1)
+    return lambda: ns.alpha
+
+
+@benchmark('dotdict.baseline.namespace.setattr')
+def _():
+    ns = SimpleNamespace(alpha=1)
+    return lambda: setattr(ns, 'alpha', 2)
+
+
+def _table(size):
+    return dict(('k%d' % i, i) for i in range(size))
+
+
+for _size in (10, 1000, 100000):
+    _items = _table(_size)
+    _pairs = list(_items.items())
+    benchmark('dotdict.immutable.init%d' % _size)(
+        lambda items=_items: lambda: ImmutableDotDict(items))
+    benchmark('dotdict.immutable.init.pairs%d' % _size)(
+        lambda pairs=_pairs: lambda: ImmutableDotDict(pairs))
+    benchmark('dotdict.immutable.from_items.pairs%d' % _size)(
+        lambda pairs=_pairs: lambda: ImmutableDotDict.from_items(pairs))
+    benchmark('dotdict.view.init%d' % _size)(
+        lambda items=_items: lambda: DotDictView(items))
+    memory_benchmark('dotdict.memory.immutable%d' % _size, deep=False)(
+        lambda items=_items: ImmutableDotDict(items))
+    memory_benchmark('dotdict.memory.view%d' % _size, deep=False)(
+        lambda items=_items: DotDictView(items))
+
+
+@benchmark('dotdict.view.getattr')
+def _():
+    v = DotDictView({'alpha': 1})
+    return lambda: v.alpha
+
+
+@benchmark('dotdict.recursive.getattr.depth4')
+def _():
+    d = RecursiveDotDict(nested_dict(4, 8))
+    return lambda: d.k3.k2.k1.k0
+
+
+@benchmark('dotdict.recursive.wrap.depth4.width64')
+def _():
+    raw = nested_dict(4, 64)
+    return lambda: RecursiveDotDict(raw).k3.k2.k1.k0
+
+
+@benchmark('dotdict.frozen.init.depth3.width8')
+def _():
+    raw = nested_dict(3, 8)
+    return lambda: FrozenDotDict(raw)
+
+
+@benchmark('dotdict.frozen.hash.cached')
+def _():
+    d = FrozenDotDict(nested_dict(3, 8))
+    hash(d)
+    return lambda: hash(d)
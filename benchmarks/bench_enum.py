@@ -0,0 +1,110 @@
+"""`Enum` / `EnumInt` benchmarks.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+from core.benchmarks.generators import names
+from core.benchmarks.harness import benchmark
+from core.enum import Enum, EnumFlag, EnumInt
+
+
+for _size in (8, 256):
+    _names = names(_size)
+    benchmark('enum.init%d' % _size)(
+        lambda n=_names: lambda: Enum(*n))
+    benchmark('enumint.init%d' % _size)(
+        lambda n=_names: lambda: EnumInt(*n))
+
+
+@benchmark('enum.getattr')
+def _():
+    e = Enum(*names(64))
+    return lambda: e.n32
+
+
+@benchmark('enum.name_of')
+def _():
+    e = Enum(*names(64))
+    return lambda: e.name_of('n32')
+
+
+@benchmark('enumint.getattr')
+def _():
+    e = EnumInt(*names(64))
+    return lambda: e.n32
+
+
+@benchmark('enumint.name_of')
+def _():
+    e = EnumInt(*names(64))
+    return lambda: e.name_of(33)
+
+
+@benchmark('enum.contains')
+def _():
+    e = Enum(*names(64))
+    return lambda: 'n32' in e
+
+
+@benchmark('enum.contains_value')
+def _():
+    e = Enum(*names(64))
+    return lambda: e.contains_value('n32')
+
+
+@benchmark('enum.dict.name_of')
+def _():
+    e = Enum(dict((n, n.upper()) for n in names(64)))
+    return lambda: e.name_of('N32')
+
+
+@benchmark('enumint.ordinal')
+def _():
+    e = EnumInt(*names(64))
+    return lambda: e.ordinal('n32')
+
+
+def _bulk(size):
+    def encode():
+        e = EnumInt(*names(64))
+        data = [names(64)[i % 64] for i in range(size)]
+        return lambda: e.encode(data)
+
+    def decode():
+        e = EnumInt(*names(64))
+        data = [i % 64 + 1 for i in range(size)]
+        return lambda: e.decode(data)
+    return encode, decode
+
+
+for _size in (100, 10000):
+    _encode, _decode = _bulk(_size)
+    benchmark('enumint.encode%d' % _size)(_encode)
+    benchmark('enumint.decode%d' % _size)(_decode)
+
+
+@benchmark('enumflag.mask8')
+def _():
+    e = EnumFlag(*names(32))
+    members = names(32)[::4]
+    return lambda: e.mask(members)
+
+
+@benchmark('enumflag.names_of8')
+def _():
+    e = EnumFlag(*names(32))
+    mask = e.mask(names(32)[::4])
+    return lambda: e.names_of(mask)
+
+
+@benchmark('enumflag.has')
+def _():
+    e = EnumFlag(*names(32))
+    mask = e.mask(names(32)[::4])
+    return lambda: e.has(mask, 'n16')
+
+
+@benchmark('enumflag.baseline.list_membership')
+def _():
+    members = names(32)[::4]
+    return lambda: 'n16' in members
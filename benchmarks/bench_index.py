@@ -0,0 +1,69 @@
+"""`IndexManager` benchmarks: indexed lookups versus full scans, and the
+listener overhead an index adds to attribute updates.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+from core.benchmarks.generators import controller_class
+from core.benchmarks.harness import benchmark
+from core.index import IndexManager
+
+
+def _population(count, kind=None):
+    cls = controller_class(2, 1, name='BenchIndexed')
+    ctrls = []
+    for i in range(count):
+        ctrl = cls.new()
+        ctrl.a0 = i % 100
+        ctrl.a1 = i
+        ctrls.append(ctrl)
+    indexes = IndexManager()
+    if kind:
+        indexes.declare(cls, 'k0_0', 'hash')
+        indexes.declare(cls, 'k1_0', kind)
+        for ctrl in ctrls:
+            indexes.track(ctrl)
+    return cls, ctrls, indexes
+
+
+def _find(count, indexed):
+    def setup():
+        cls, ctrls, indexes = _population(count, 'sorted' if indexed else None)
+        if indexed:
+            return lambda: indexes.find(cls, 'k0_0', 42)
+        return lambda: [c for c in ctrls if c.model['k0_0'] == 42]
+    return setup
+
+
+def _range(count, indexed):
+    def setup():
+        cls, ctrls, indexes = _population(count, 'sorted' if indexed else None)
+        low, high = count // 2, count // 2 + 100
+        if indexed:
+            return lambda: indexes.range(cls, 'k1_0', low, high)
+        return lambda: [c for c in ctrls if low <= c.model['k1_0'] <= high]
+    return setup
+
+
+for _count in (1000, 10000):
+    benchmark('index.find.scan%d' % _count)(_find(_count, False))
+    benchmark('index.find.hash%d' % _count)(_find(_count, True))
+    benchmark('index.range.scan%d' % _count)(_range(_count, False))
+    benchmark('index.range.sorted%d' % _count)(_range(_count, True))
+
+
+def _setattr(kind):
+    def setup():
+        cls, ctrls, indexes = _population(1000, kind)
+        ctrl, values = ctrls[500], [1, 2]
+
+        def step():
+            ctrl.a1 = values[0]
+            ctrl.a1 = values[1]
+        return step
+    return setup
+
+
+benchmark('index.setattr.unindexed')(_setattr(None))
+benchmark('index.setattr.hash')(_setattr('hash'))
+benchmark('index.setattr.sorted')(_setattr('sorted'))
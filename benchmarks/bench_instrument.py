@@ -0,0 +1,139 @@
+"""`core.instrument` benchmarks and a loopback check of its sinks.
+
+Compares controller updates with instrumentation off (the single `ACTIVE`
+check per call site) against updates recorded by a `Recorder` or sent to
+statsd. Run this module directly to check that `StatsdSink` emits one
+well-formed datagram per sample over loopback UDP:
+
+    python -m core.benchmarks.bench_instrument [updates]
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+import re
+import socket
+import sys
+from threading import Event, Thread
+
+from core import instrument
+from core.benchmarks.generators import controller_class
+from core.benchmarks.harness import benchmark
+
+
+_DATAGRAM = re.compile(r'^[\w.]+:-?\d+(\.\d+)?\|(ms|c|g)$')
+
+UPDATES = 100
+
+
+def loopback(updates=UPDATES):
+    """Send the samples of `updates` controller updates to a local UDP
+    socket through `StatsdSink`.
+
+    A `CallbackSink` installed alongside counts the samples sent. Datagrams
+    are received on a thread while sending, so the socket buffer cannot
+    overflow.
+
+    :param updates: int -- Number of attribute updates.
+    :return: dict -- 'sent' and 'received' datagram counts, and 'invalid'
+        datagrams not in statsd format.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(0.05)
+    datagrams = []
+    done = Event()
+
+    def receive():
+        while True:
+            try:
+                datagrams.append(server.recv(65536).decode('utf-8'))
+            except socket.timeout:
+                if done.is_set():
+                    return
+
+    receiver = Thread(target=receive)
+    receiver.start()
+    statsd = instrument.StatsdSink(*server.getsockname(), prefix='bench')
+    sent = []
+    counter = instrument.CallbackSink(lambda *sample: sent.append(sample))
+    ctrl = controller_class(2, 1, name='BenchInstrumented').new()
+    instrument.enable(statsd, counter)
+    try:
+        for i in range(updates):
+            ctrl.a0 = i
+        instrument.gauge('bench', 'loopback', 'depth', updates)
+    finally:
+        instrument.disable(statsd)
+        instrument.disable(counter)
+        statsd.close()
+        done.set()
+        receiver.join()
+        server.close()
+    return {'sent': len(sent), 'received': len(datagrams),
+            'invalid': [d for d in datagrams if not _DATAGRAM.match(d)]}
+
+
+def _updates(*sinks):
+    """`UPDATES` attribute updates, with `sinks` installed (if any)."""
+    def setup():
+        ctrl = controller_class(2, 1, name='BenchInstrumented').new()
+        values = range(UPDATES)
+
+        def step():
+            if sinks:
+                instrument.enable(*sinks)
+            try:
+                for value in values:
+                    ctrl.a0 = value
+            finally:
+                for sink in sinks:
+                    instrument.disable(sink)
+        return step
+    return setup
+
+
+@benchmark('instrument.guard.baseline')
+def _():
+    return lambda: None
+
+
+@benchmark('instrument.guard.disabled')
+def _():
+    return lambda: instrument.clock() if instrument.ACTIVE else None
+
+
+benchmark('instrument.setattr%d.disabled' % UPDATES)(_updates())
+benchmark('instrument.setattr%d.recorder' % UPDATES)(
+    _updates(instrument.Recorder()))
+
+
+@benchmark('instrument.setattr%d.statsd' % UPDATES)
+def _():
+    return _updates(instrument.StatsdSink('127.0.0.1', 9))()
+
+
+@benchmark('instrument.statsd.loopback')
+def _():
+    def run():
+        result = loopback()
+        if result['received'] != result['sent'] or result['invalid']:
+            raise RuntimeError('statsd loopback: %(received)d of %(sent)d '
+                               'datagrams received, invalid: %(invalid)r' %
+                               result)
+    return run
+
+
+def main(argv=None):
+    args = [int(a) for a in (argv or sys.argv[1:])]
+    result = loopback(*args)
+    print('%(received)d / %(sent)d datagrams received, %(invalid)d invalid'
+          % dict(result, invalid=len(result['invalid'])))
+    for datagram in result['invalid']:
+        print('invalid: ' + datagram)
+    return 0 if (result['received'] == result['sent'] and
+                 not result['invalid']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Write-behind persistence benchmarks.
+
+Compares the request-path cost of an update followed by a synchronous
+`save` with the same update through a `WriteBehindQueue`, and the cost of
+flushing coalesced controllers in bulk.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+from core.benchmarks.bench_store import Counter
+from core.benchmarks.harness import benchmark
+from core.persist import WriteBehindQueue
+from core.store import SQLiteStore
+
+
+def _store():
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, True)
+    return SQLiteStore(os.path.join(directory, 'persist.db'))
+
+
+@benchmark('persist.sqlite.update.sync_save')
+def _():
+    store = _store()
+    counter = Counter.new(store)
+
+    def step():
+        counter.count += 1
+        counter.save(store)
+    return step
+
+
+@benchmark('persist.sqlite.update.write_behind')
+def _():
+    store = _store()
+    queue = WriteBehindQueue(store, interval=0.01)
+    counter = queue.attach(Counter.new(store))
+
+    def step():
+        counter.count += 1
+    return step
+
+
+def _flush(count, batch):
+    def setup():
+        store = _store()
+        if not batch:
+            # Hide `batch` so every save commits on its own.
+            store.batch = None
+        queue = WriteBehindQueue(store, interval=3600)
+        counters = [queue.attach(Counter.new(store)) for _ in range(count)]
+
+        def step():
+            for counter in counters:
+                counter.count += 1
+            queue.flush()
+        return step
+    return setup
+
+
+benchmark('persist.sqlite.flush100.batched')(_flush(100, True))
+benchmark('persist.sqlite.flush100.unbatched')(_flush(100, False))
@@ -0,0 +1,114 @@
+"""Package import (startup) benchmarks.
+
+Each benchmark imports a module in a fresh interpreter. Compare against
+'startup.baseline.interpreter' to get the import cost alone. Run this
+module directly for a breakdown of the cumulative import time of every
+module loaded (from `-X importtime` on Python 3.7+, otherwise by importing
+each module in its own fresh interpreter):
+
+    python -m core.benchmarks.bench_startup [module ...]
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+import os
+import subprocess
+import sys
+
+from core.benchmarks.harness import benchmark, clock
+
+
+# `__name__` is '__main__' when run with `-m`; `__package__` is only set
+#   then (on Python 2).
+PACKAGE = (__package__ or __name__).split('.')[0]
+
+MODULES = (PACKAGE, PACKAGE + '.dotdict', PACKAGE + '.enum',
+           PACKAGE + '.datamodel')
+
+
+def _environ():
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [p for p in [env.get('PYTHONPATH')] if p])
+    return env
+
+
+def _importer(statement):
+    def setup():
+        command = [sys.executable, '-c', statement]
+        env = _environ()
+        return lambda: subprocess.check_call(command, env=env)
+    return setup
+
+
+benchmark('startup.baseline.interpreter')(_importer('pass'))
+for _module in MODULES:
+    benchmark('startup.import.' + _module)(_importer('import ' + _module))
+
+
+def _best_time(statement, repeat=3):
+    """Best wall time of running `statement` in a fresh interpreter."""
+    command = [sys.executable, '-c', statement]
+    env = _environ()
+    best = None
+    for _ in range(repeat):
+        start = clock()
+        subprocess.check_call(command, env=env)
+        elapsed = clock() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _loaded_modules(module):
+    """Modules loaded by importing `module` in a fresh interpreter."""
+    output = subprocess.check_output(
+        [sys.executable, '-c',
+         'import sys; before = set(sys.modules); import %s; '
+         'print(" ".join(name for name, m in sys.modules.items() '
+         'if m is not None and name not in before))' % module],
+        env=_environ(), universal_newlines=True)
+    return output.split()
+
+
+def import_times(module):
+    """Cumulative import time of each module loaded by importing `module`.
+
+    Uses `python -X importtime` where available (Python 3.7+). Otherwise
+    every loaded module is imported on its own in a fresh interpreter, and
+    the time of starting a bare interpreter is subtracted.
+
+    :param module: str -- Module to import.
+    :return: list -- (module name, cumulative seconds) pairs, slowest first.
+    """
+    if sys.version_info < (3, 7):
+        baseline = _best_time('pass')
+        times = [(name, max(0.0, _best_time('import ' + name) - baseline))
+                 for name in _loaded_modules(module)]
+        times.sort(key=lambda t: t[1], reverse=True)
+        return times
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.PIPE, env=_environ(), universal_newlines=True)
+    _, err = process.communicate()
+    times = []
+    for line in err.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times.append((name.strip(), int(cumulative) / 1e6))
+    times.sort(key=lambda t: t[1], reverse=True)
+    return times
+
+
+def main(argv=None):
+    for module in (argv or sys.argv[1:]) or MODULES:
+        print(module)
+        for name, seconds in import_times(module)[:15]:
+            print('  %-40s %8.2f ms' % (name, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
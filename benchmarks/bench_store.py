@@ -0,0 +1,191 @@
+"""Data store benchmarks, including multi-process save contention.
+
+Run this module directly to check that models survive a save / reload /
+save round trip in every store and that concurrent compare-and-set saves
+lose no updates:
+
+    python -m core.benchmarks.bench_store [processes] [increments]
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+"""
+
+from multiprocessing import Process, Queue
+import os
+import shutil
+import sys
+import tempfile
+
+from core.benchmarks.harness import benchmark, clock
+from core.datamodel import DataModelController
+from core.decorators import classproperty
+from core.exceptions import ConflictError
+from core.store import MemoryStore, SQLiteStore
+
+
+class Counter(DataModelController):
+    """Controller holding a single counter."""
+
+    @classproperty
+    def MODEL_RULES(cls):
+        rules = DataModelController.MODEL_RULES
+        rules['count'] = ('count', int, None)
+        return rules
+
+    @classproperty
+    def INIT_DEFAULTS(cls):
+        defaults = DataModelController.INIT_DEFAULTS
+        defaults['count'] = 0
+        return defaults
+
+
+class Person(DataModelController):
+    """Controller whose name keys are computed by operations."""
+
+    @classproperty
+    def MODEL_RULES(cls):
+        rules = DataModelController.MODEL_RULES
+        rules['firstname'] = ('name', str, lambda name: name.split(' ')[0])
+        rules['lastname'] = ('name', str, lambda name: name.split(' ')[-1])
+        return rules
+
+    @classproperty
+    def INIT_DEFAULTS(cls):
+        defaults = DataModelController.INIT_DEFAULTS
+        defaults['name'] = 'x y'
+        return defaults
+
+
+def roundtrip(store):
+    """Save a model, reload it from `store` and save it again.
+
+    :return: list -- Problems found; empty if the stored values survived.
+    """
+    expected = {'firstname': 'Gene', 'lastname': 'Belcher'}
+    person = Person.new(store, name='Gene Belcher')
+    person.save(store)
+    person.delete_cache(store)
+    person = Person.load(store, person.uid)
+    problems = []
+    if person.model.changes():
+        problems.append('changed on reload: %r' % person.model.changes())
+    person.save(store)
+    stored = store.load_model(Person, person.uid)
+    for key, value in expected.iteritems():
+        if stored[key] != value:
+            problems.append('%s stored as %r, not %r' %
+                            (key, stored[key], value))
+    return problems
+
+
+def _increment(store, uid):
+    """Increment the counter, reloading only after a conflict.
+
+    :return: int -- Number of conflicts.
+    """
+    conflicts = 0
+    while True:
+        counter = Counter.load(store, uid)
+        counter.count += 1
+        try:
+            counter.save(store)
+            return conflicts
+        except ConflictError:
+            counter.delete_cache(store)
+            conflicts += 1
+
+
+def _worker(path, uid, increments, results):
+    store = SQLiteStore(path)
+    conflicts = 0
+    for _ in range(increments):
+        conflicts += _increment(store, uid)
+    store.close()
+    results.put(conflicts)
+
+
+def contention(processes=4, increments=50):
+    """Increment one counter from several processes sharing an SQLite file.
+
+    :param processes: int -- Number of worker processes.
+    :param increments: int -- Increments per worker.
+    :return: dict -- 'expected' and stored 'count' (equal unless updates
+        were lost), total 'conflicts' and 'seconds' elapsed.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'contention.db')
+        store = SQLiteStore(path)
+        counter = Counter.new(store)
+        counter.save(store)
+        results = Queue()
+        workers = [Process(target=_worker,
+                           args=(path, counter.uid, increments, results))
+                   for _ in range(processes)]
+        start = clock()
+        for worker in workers:
+            worker.start()
+        conflicts = sum(results.get() for _ in workers)
+        for worker in workers:
+            worker.join()
+        elapsed = clock() - start
+        count = store.load_model(Counter, counter.uid)['count']
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+    return {'expected': processes * increments, 'count': count,
+            'conflicts': conflicts, 'seconds': elapsed}
+
+
+def _save(store_factory):
+    def setup():
+        store = store_factory()
+        counter = Counter.new(store)
+
+        def step():
+            counter.count += 1
+            counter.save(store)
+        return step
+    return setup
+
+
+benchmark('store.memory.save')(_save(MemoryStore))
+benchmark('store.sqlite.save')(_save(SQLiteStore))
+
+
+@benchmark('store.roundtrip')
+def _():
+    def run():
+        for store in (MemoryStore(), SQLiteStore()):
+            problems = roundtrip(store)
+            if problems:
+                raise RuntimeError('%s round trip: %s' % (
+                    store.__class__.__name__, '; '.join(problems)))
+    return run
+
+
+@benchmark('store.sqlite.contention.procs4')
+def _():
+    def run():
+        result = contention(4, 25)
+        if result['count'] != result['expected']:
+            raise RuntimeError('Lost updates: %(count)d of %(expected)d '
+                               'increments stored.' % result)
+    return run
+
+
+def main(argv=None):
+    args = [int(a) for a in (argv or sys.argv[1:])]
+    failed = False
+    for store in (MemoryStore(), SQLiteStore()):
+        problems = roundtrip(store)
+        print('%s round trip: %s' % (store.__class__.__name__,
+                                     '; '.join(problems) or 'ok'))
+        failed = failed or bool(problems)
+    result = contention(*args)
+    print('%(count)d / %(expected)d increments stored, %(conflicts)d '
+          'conflicts, %(seconds).3f s' % result)
+    return 0 if result['count'] == result['expected'] and not failed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Synthetic controllers and data for benchmarks.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :callable controller_class -- Generate a `DataModelController` subclass
+        with a configurable number of keys, binding fan-out and collection.
+    :callable derived_controller_class -- Generate a controller class with
+        chains of derived keys.
+    :callable nested_controller_classes -- Generate parent/child controller
+        classes linked through a `Collection.List(DataModel)` key.
+    :callable nested_tree -- Build a tree of nested controllers.
+    :callable nested_dict -- Build a nested dict of given depth and width.
+    :callable names -- Generate distinct identifier names.
+"""
+
+from core.datamodel import (Collection, DataModel, DataModelController,
+                            Derived)
+from core.decorators import classproperty
+
+
+def names(count, prefix='n'):
+    """Generate `count` distinct identifier names."""
+    return ['%s%d' % (prefix, i) for i in range(count)]
+
+
+def _identity(scope):
+    return scope
+
+
+def controller_class(n_keys=4, fanout=1, collection=None, subtype=None,
+                     name=None):
+    """Generate a controller class.
+
+    Attributes `a0`..`a<n_keys-1>` hold ints; each is bound to `fanout`
+    model keys `k<i>_<j>`. If `collection` is 'list' or 'dict', attribute
+    `items` is bound to model key `items` of that collection type.
+
+    :param n_keys: int -- Number of bound attributes.
+    :param fanout: int -- Model keys per bound attribute.
+    :param collection: str | None -- 'list', 'dict' or None.
+    :param subtype: type | None -- Collection element type.
+    :param name: str | None -- Class name.
+    :return: type -- `DataModelController` subclass.
+    """
+    rules = dict(DataModelController.MODEL_RULES)
+    defaults = dict(DataModelController.INIT_DEFAULTS)
+    for i in range(n_keys):
+        defaults['a%d' % i] = 0
+        for j in range(fanout):
+            rules['k%d_%d' % (i, j)] = ('a%d' % i, int, _identity)
+    if collection == 'list':
+        rules['items'] = ('items', Collection.List(subtype), None)
+        defaults['items'] = []
+    elif collection == 'dict':
+        rules['items'] = ('items', Collection.Dict(subtype), None)
+        defaults['items'] = {}
+
+    # noinspection PyMethodParameters,PyPep8Naming
+    def MODEL_RULES(cls):
+        return dict(rules)
+
+    # noinspection PyMethodParameters,PyPep8Naming
+    def INIT_DEFAULTS(cls):
+        return dict(defaults)
+
+    name = name or 'Bench%dx%d%s' % (n_keys, fanout, collection or '')
+    return type(name, (DataModelController,), {
+        'MODEL_RULES': classproperty(MODEL_RULES),
+        'INIT_DEFAULTS': classproperty(INIT_DEFAULTS)
+    })
+
+
+def _increment(value):
+    return value + 1
+
+
+def _repeat_increment(steps):
+    def operation(value):
+        for _ in range(steps):
+            value += 1
+        return value
+    return operation
+
+
+def derived_controller_class(depth, width=1, rebound=False):
+    """Generate a controller class with chains of keys derived from `a0`.
+
+    Based on `controller_class(2, 1)`. Each of the `width` chains holds
+    `depth` keys `d<c>_<n>`, each deriving its value from the previous
+    key in the chain (the first from `k0_0`). Attribute `a1` is not part
+    of any chain.
+
+    :param depth: int -- Keys per chain.
+    :param width: int -- Number of chains.
+    :param rebound: bool -- If True, chain keys are instead each bound
+        directly to `a0` and recompute the whole chain themselves, i.e. how
+        such keys had to be declared before `Derived` keys.
+    :return: type -- `DataModelController` subclass.
+    """
+    base = controller_class(2, 1)
+    rules = dict(base.MODEL_RULES)
+    for c in range(width):
+        previous = 'k0_0'
+        for n in range(1, depth + 1):
+            key = 'd%d_%d' % (c, n)
+            if rebound:
+                rules[key] = ('a0', int, _repeat_increment(n))
+            else:
+                rules[key] = (Derived(previous), int, _increment)
+            previous = key
+
+    # noinspection PyMethodParameters,PyPep8Naming
+    def MODEL_RULES(cls):
+        return dict(rules)
+
+    return type('BenchDerived%dx%d' % (depth, width), (base,), {
+        'MODEL_RULES': classproperty(MODEL_RULES)
+    })
+
+
+def _model_of(ctrl):
+    return ctrl.model
+
+
+def nested_controller_classes(depth):
+    """Generate `depth` controller classes, each holding a list of the next.
+
+    The innermost class is a plain `controller_class`; every outer class
+    binds attribute `children` to a `Collection.List(DataModel)` key.
+
+    :param depth: int -- Number of levels (>= 1).
+    :return: list -- Classes from outermost to innermost.
+    """
+    classes = [controller_class(2, 1, name='Leaf')]
+    for level in range(1, depth):
+        rules = dict(DataModelController.MODEL_RULES)
+        rules['children'] = ('children', Collection.List(DataModel),
+                             _model_of)
+
+        # noinspection PyMethodParameters,PyPep8Naming
+        def MODEL_RULES(cls, rules=rules):
+            return dict(rules)
+
+        # noinspection PyMethodParameters,PyPep8Naming
+        def INIT_DEFAULTS(cls):
+            defaults = dict(DataModelController.INIT_DEFAULTS)
+            defaults['children'] = []
+            return defaults
+
+        classes.insert(0, type('Level%d' % level, (DataModelController,), {
+            'MODEL_RULES': classproperty(MODEL_RULES),
+            'INIT_DEFAULTS': classproperty(INIT_DEFAULTS)
+        }))
+    return classes
+
+
+def nested_tree(depth, width):
+    """Build a tree of nested controllers.
+
+    :param depth: int -- Number of levels.
+    :param width: int -- Children per non-leaf controller.
+    :return: DataModelController -- The root controller.
+    """
+    def build(classes):
+        if len(classes) == 1:
+            return classes[0].new()
+        return classes[0].new(children=[build(classes[1:])
+                                        for _ in range(width)])
+    return build(nested_controller_classes(depth))
+
+
+def nested_dict(depth, width):
+    """Build a nested dict.
+
+    :param depth: int -- Nesting levels.
+    :param width: int -- Keys per level.
+    :return: dict
+    """
+    if depth <= 1:
+        return dict((k, i) for i, k in enumerate(names(width, 'k')))
+    return dict((k, nested_dict(depth - 1, width))
+                for k in names(width, 'k'))
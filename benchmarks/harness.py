@@ -0,0 +1,228 @@
+"""Benchmark registry, timing harness and baseline comparison.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :callable benchmark -- Decorator registering a timing benchmark.
+    :callable memory_benchmark -- Decorator registering a memory benchmark.
+    :callable deep_sizeof -- Approximate recursive size of an object.
+    :callable run -- Run registered benchmarks.
+    :callable compare -- Find regressions against a baseline result set.
+    :callable save -- Write results as JSON.
+    :callable load -- Read JSON results.
+"""
+
+import gc
+import json
+import platform
+import sys
+import time
+
+
+clock = getattr(time, 'perf_counter', time.time)
+
+REGISTRY = []
+
+
+class Benchmark(object):
+    """Registered benchmark.
+
+    Properties:
+        :type name: str -- Dotted benchmark name, e.g. 'dotdict.getattr.hit'.
+        :type setup: callable () -> mixed -- For 'seconds' benchmarks returns
+            the zero-argument callable to time; for 'bytes' benchmarks
+            returns the object to size.
+        :type metric: str -- 'seconds' or 'bytes'.
+        :type deep: bool -- For 'bytes' benchmarks, whether the size is
+            measured recursively (`deep_sizeof`) or shallow
+            (`sys.getsizeof`).
+    """
+
+    def __init__(self, name, setup, metric, deep=True):
+        self.name, self.setup, self.metric = name, setup, metric
+        self.deep = deep
+
+
+def benchmark(name):
+    """Register a timing benchmark.
+
+    The decorated function performs any setup and returns the zero-argument
+    callable to be timed.
+
+    Usage:
+        @benchmark('dotdict.getattr.hit')
+        def _():
+            d = DotDict(a=1)
+            return lambda: d.a
+    """
+    def decorator(setup):
+        REGISTRY.append(Benchmark(name, setup, 'seconds'))
+        return setup
+    return decorator
+
+
+def memory_benchmark(name, deep=True):
+    """Register a memory benchmark.
+
+    The decorated function returns the object whose size is reported.
+
+    :param deep: bool -- If False, only the object itself is measured
+        (`sys.getsizeof`), e.g. to compare container overhead.
+    """
+    def decorator(setup):
+        REGISTRY.append(Benchmark(name, setup, 'bytes', deep))
+        return setup
+    return decorator
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate recursive size of an object in bytes.
+
+    Follows dicts, sequences, sets and instance `__dict__`s. Shared objects
+    are only counted once.
+
+    :param obj: mixed
+    :return: int
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += deep_sizeof(k, seen) + deep_sizeof(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for x in obj:
+            size += deep_sizeof(x, seen)
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        size += deep_sizeof(obj.__dict__, seen)
+    return size
+
+
+def _calibrate(func, min_time):
+    number = 1
+    while True:
+        start = clock()
+        for _ in range(number):
+            func()
+        if clock() - start >= min_time or number >= 1 << 24:
+            return number
+        number *= 4
+
+
+def measure(func, repeat=5, min_time=0.05):
+    """Time a callable.
+
+    The loop count is calibrated so that each of the `repeat` batches runs
+    for at least `min_time` seconds. GC is disabled while timing.
+
+    :param func: callable () -> mixed
+    :param repeat: int -- Number of timed batches.
+    :param min_time: float -- Minimum seconds per batch.
+    :return: tuple (int, list) -- Loop count and per-call seconds per batch.
+    """
+    number = _calibrate(func, min_time)
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = clock()
+            for _ in range(number):
+                func()
+            samples.append((clock() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return number, samples
+
+
+def _selected(name, filters):
+    return not filters or any(f in name for f in filters)
+
+
+def run(filters=None, repeat=5, min_time=0.05, report=None):
+    """Run registered benchmarks.
+
+    :param filters: list | None -- Substrings; only benchmarks whose name
+        contains one of them are run. If None, all are run.
+    :param repeat: int -- Timed batches per benchmark.
+    :param min_time: float -- Minimum seconds per batch.
+    :param report: callable (str, dict) | None -- Called after each
+        benchmark with its name and result.
+    :return: dict -- Machine-readable results with 'meta' and 'results', and
+        'skipped': names of benchmarks whose setup raised `ImportError`
+        (i.e. an optional dependency is missing) mapped to the error.
+    """
+    results = {}
+    skipped = {}
+    for bench in REGISTRY:
+        if not _selected(bench.name, filters):
+            continue
+        try:
+            prepared = bench.setup()
+        except ImportError as e:
+            skipped[bench.name] = str(e)
+            continue
+        if bench.metric == 'bytes':
+            obj = prepared
+            size = deep_sizeof(obj) if bench.deep else sys.getsizeof(obj)
+            result = {'metric': 'bytes', 'best': size}
+        else:
+            number, samples = measure(prepared, repeat, min_time)
+            mean = sum(samples) / len(samples)
+            stdev = (sum((s - mean) ** 2 for s in samples) /
+                     len(samples)) ** 0.5
+            result = {'metric': 'seconds', 'best': min(samples),
+                      'mean': mean, 'stdev': stdev, 'number': number,
+                      'repeat': repeat}
+        results[bench.name] = result
+        if report:
+            report(bench.name, result)
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.time()
+        },
+        'results': results,
+        'skipped': skipped
+    }
+
+
+def compare(current, baseline, tolerance=0.1):
+    """Find regressions against a baseline.
+
+    Compares the 'best' value of every benchmark present in both result
+    sets.
+
+    :param current: dict -- Results from `run`.
+    :param baseline: dict -- Previously saved results from `run`.
+    :param tolerance: float -- Allowed relative slowdown / growth.
+    :return: list -- (name, baseline, current, ratio) tuples for each
+        benchmark exceeding the tolerance, sorted by ratio descending.
+    """
+    regressions = []
+    base = baseline['results']
+    for name, result in current['results'].items():
+        if name not in base or not base[name]['best']:
+            continue
+        ratio = result['best'] / float(base[name]['best'])
+        if ratio > 1 + tolerance:
+            regressions.append((name, base[name]['best'], result['best'],
+                                ratio))
+    regressions.sort(key=lambda r: r[3], reverse=True)
+    return regressions
+
+
+def save(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
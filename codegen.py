@@ -0,0 +1,177 @@
+"""Schema-compiled controller classes.
+
+`compiled_controller` reads a controller class's `MODEL_RULES` once and
+generates Python source for it: one setter per bound attribute that
+evaluates exactly the model keys depending on that attribute (including
+root-bound and derived keys), with the type checks inlined, then commits
+them to the `DataModel` at once and dispatches the listeners of those keys
+directly. Setters are dispatched from a generated `__setattr__`, so
+attribute reads stay plain instance attribute lookups.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :callable compiled_controller -- Class decorator compiling a controller
+        class's rules.
+
+Usage:
+    @compiled_controller
+    class PhoneRecord(DataModelController):
+        MODEL_RULES = ...
+
+    PhoneRecord._compiled_source #-> generated source, for inspection
+"""
+
+from core import instrument
+from core.datamodel import (DataModel, DataModelController,
+                            _collection_kind)
+
+
+def _type_check(lines, var, rule, key):
+    if rule.type is None:
+        return
+    lines.append('        if not isinstance(%s, %s_type):' % (var, var))
+    lines.append('            raise TypeError(%r)' % (
+        'Datamodel expected value with type `' + rule.type.__name__ +
+        '` for key: ' + key))
+
+
+def _setter_source(attr, keys, derived, rules, namespace, index):
+    """Generate the setter for one bound attribute.
+
+    :param attr: str -- Attribute name.
+    :param keys: list -- Directly updated keys (bound to `attr` or to the
+        controller itself).
+    :param derived: list -- Affected derived keys, in dependency order.
+    :param rules: dict -- Keys mapped to `Rule`s.
+    :param namespace: dict -- Globals of the generated code; operations and
+        types are added to it.
+    :param index: int -- Unique setter number.
+    :return: tuple (str, str) -- Function name and source.
+    """
+    name = '_set_%d' % index
+    lines = ['def %s(self, value):' % name,
+             '    setattr_(self, %r, value)' % attr,
+             '    try:',
+             '        if instrument.ACTIVE:',
+             '            self._update_model(%r)' % attr,
+             '            return',
+             '        model = self._DataModelController__model']
+    # Stored values of derived keys' dependencies outside this update. If
+    #   one is unset, defer to the interpreted path (whose AttributeError is
+    #   ignored like any other during init).
+    external = sorted(set(dep for key in derived for dep in rules[key].derived
+                          if dep not in keys and dep not in derived))
+    if external:
+        lines.append('        try:')
+        lines.extend('            d%d = model[%r]' % (i, dep)
+                     for i, dep in enumerate(external))
+        lines.extend(['        except KeyError:',
+                      '            self._update_model(%r)' % attr,
+                      '            return'])
+    local = dict((dep, 'd%d' % i) for i, dep in enumerate(external))
+    for key in keys + derived:
+        rule = rules[key]
+        var = 'v%d_%d' % (index, len(local))
+        namespace[var + '_op'] = rule.operation
+        namespace[var + '_type'] = rule.type
+        if rule.derived:
+            args = ', '.join(local[dep] for dep in rule.derived)
+            lines.append('        %s = %s_op(%s)' % (var, var, args))
+        elif rule.binding:
+            lines.append('        %s = %s_op(value)' % (var, var))
+        else:
+            lines.append('        %s = %s_op(self)' % (var, var))
+        _type_check(lines, var, rule, key)
+        local[key] = var
+    all_keys = keys + derived
+    namespace[name + '_keys'] = tuple(all_keys)
+    lines.append('        model._commit({%s})' % ', '.join(
+        '%r: %s' % (key, local[key]) for key in all_keys))
+    lines.extend([
+        '        listeners = self._DataModelController__listeners',
+        '        if listeners:',
+        '            for key in %s_keys:' % name,
+        '                if key in listeners:',
+        '                    self._call_listener(key)',
+        '        if self._write_behind is not None:',
+        '            self._write_behind.mark(self)',
+        '        if self._DataModelController__parents:',
+        '            self._propagate_change(%s_keys)' % name,
+        '    except (AttributeError, NameError):',
+        '        pass',
+        ''])
+    return name, '\n'.join(lines)
+
+
+def compiled_controller(cls):
+    """Compile a controller class's `MODEL_RULES` into specialized setters.
+
+    Attributes bound to a `Collection` key (or to several attributes at
+    once), and every attribute if a root-bound key is a `Collection`, keep
+    the interpreted `DataModelController.__setattr__` path, as do all
+    updates while `instrument` is active. Subclasses of a compiled class
+    use the interpreted path unless compiled themselves.
+
+    The generated code assumes instances' models follow the class's
+    `MODEL_RULES` (as models created with `new` do).
+
+    :param cls: type -- `DataModelController` subclass.
+    :return: type -- `cls`, with `__setattr__`, `_compiled_setters` and
+        `_compiled_source` set.
+    :raises TypeError if `cls` is not a controller class, or defines or
+        inherits a custom `__setattr__`.
+    """
+    if not issubclass(cls, DataModelController):
+        raise TypeError('compiled_controller requires a DataModelController '
+                        'subclass: ' + cls.__name__)
+    for klass in cls.__mro__:
+        if '__setattr__' in klass.__dict__:
+            if klass is not DataModelController:
+                raise TypeError('compiled_controller cannot compile a class '
+                                'with a custom __setattr__: ' + cls.__name__)
+            break
+    model = DataModel(cls.MODEL_RULES)
+    rules = model.rules
+    roots = [k for k, r in rules.iteritems() if not r.binding]
+    collections = [k for k, r in rules.iteritems()
+                   if not r.derived and _collection_kind(r.type)]
+    bound = {}
+    shared = set()
+    for key, rule in rules.iteritems():
+        if rule.derived or not rule.binding:
+            continue
+        if isinstance(rule.binding, str):
+            bound.setdefault(rule.binding, []).append(key)
+        else:
+            shared.update(rule.binding)
+    namespace = {'instrument': instrument,
+                 'setattr_': object.__setattr__}
+    setters, sources = {}, []
+    if not [k for k in roots if k in collections]:
+        for attr in sorted(bound):
+            keys = sorted(bound[attr]) + sorted(roots)
+            if attr in shared or [k for k in keys if k in collections]:
+                continue
+            name, source = _setter_source(attr, keys,
+                                          model.affected_keys(keys), rules,
+                                          namespace, len(sources))
+            setters[attr] = name
+            sources.append(source)
+    source = '\n\n'.join(sources)
+    exec(compile(source, '<compiled %s>' % cls.__name__, 'exec'), namespace)
+    setters = dict((attr, namespace[name])
+                   for attr, name in setters.iteritems())
+    interpreted = DataModelController.__setattr__
+
+    def __setattr__(self, key, value):
+        setter = setters.get(key)
+        if setter is None or self.__class__ is not cls:
+            interpreted(self, key, value)
+        else:
+            setter(self, value)
+
+    cls.__setattr__ = __setattr__
+    cls._compiled_setters = setters
+    cls._compiled_source = source
+    return cls
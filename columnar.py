@@ -0,0 +1,440 @@
+"""Memory-mapped columnar store for models of one controller class.
+
+Models are written column by column, one set of files per `DataModel` key,
+so scans and aggregations over a key read only that key's column, directly
+from the memory-mapped file, without loading models or controllers.
+Single records are rehydrated into a `DataModel` on demand.
+
+Column layouts, chosen from each key's rule type:
+    'int' -- `Integral` types; little-endian int64 values.
+    'float' -- `float`; little-endian doubles.
+    'bool' -- `bool`; one byte per value.
+    'bytes' / 'text' -- `bytes` (`str` on Python 2) / text; int64 offsets
+        (count + 1 values) into a blob of raw / UTF-8 encoded values.
+    'pickle' -- Anything else (including untyped and `Collection` keys);
+        offsets into a blob of pickled values.
+
+Files of a key: `<key>.col` for fixed-width values, `<key>.off` and
+`<key>.blob` for variable-length values. `meta.json` holds the class name,
+record count and column layouts; `@version.col` the model versions (keys
+are identifiers, so no key's files can share these names).
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :class ColumnarWriter -- Write models to a new columnar store.
+    :class ColumnarStore -- Read a columnar store.
+    :class Column -- Read-only view of one key's values.
+
+Usage:
+    with ColumnarWriter('/data/records', PhoneRecord) as writer:
+        for model in models:
+            writer.append(model)
+    with ColumnarStore('/data/records', PhoneRecord) as store:
+        store.column('balance').sum()
+        rows = store.column('lastname').where(lambda name: name == 'Belcher')
+        store.load(rows[0]) #-> DataModel
+"""
+
+import json
+import mmap
+from numbers import Integral
+import os
+import re
+import struct
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from core.datamodel import DataModel
+from core.decorators import abstract_class
+
+try:
+    _text = unicode
+except NameError:
+    _text = str
+
+
+_FIXED = {'int': 'q', 'float': 'd', 'bool': '?'}
+
+_CHUNK = 4096
+
+_KEY = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+_VERSIONS = '@version.col'
+
+
+def _layout(datatype):
+    """Column layout for a rule type."""
+    if not isinstance(datatype, type):
+        return 'pickle'
+    if issubclass(datatype, bool):
+        return 'bool'
+    if issubclass(datatype, Integral):
+        return 'int'
+    if issubclass(datatype, float):
+        return 'float'
+    if issubclass(datatype, bytes):
+        return 'bytes'
+    if issubclass(datatype, _text):
+        return 'text'
+    return 'pickle'
+
+
+def _raw(value):
+    if not isinstance(value, bytes):
+        raise TypeError('Expected bytes, got %r' % type(value))
+    return value
+
+
+def _encoder(layout):
+    if layout == 'bytes':
+        return _raw
+    if layout == 'text':
+        return lambda value: value.encode('utf-8')
+    if layout == 'pickle':
+        return lambda value: pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    return None
+
+
+def _decoder(layout):
+    if layout == 'text':
+        return lambda value: value.decode('utf-8')
+    if layout == 'pickle':
+        return pickle.loads
+    return None
+
+
+# Column writers split appending into `encode(value)`, which raises for
+#   values the column cannot hold, and `write(encoded)`, which cannot fail
+#   on the value, so a row is written to all of its columns or to none.
+
+class _FixedWriter(object):
+
+    def __init__(self, path, code):
+        self._file = open(path, 'wb')
+        self.encode = struct.Struct('<' + code).pack
+        self._buffer = []
+
+    def write(self, packed):
+        self._buffer.append(packed)
+        if len(self._buffer) >= _CHUNK:
+            self.flush()
+
+    def append(self, value):
+        self.write(self.encode(value))
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(b''.join(self._buffer))
+            del self._buffer[:]
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class _VarWriter(object):
+
+    def __init__(self, path, encode):
+        self._offsets = _FixedWriter(path + '.off', 'q')
+        self._blob = open(path + '.blob', 'wb')
+        self.encode = encode
+        self._end = 0
+        self._offsets.append(0)
+
+    def write(self, value):
+        self._blob.write(value)
+        self._end += len(value)
+        self._offsets.append(self._end)
+
+    def close(self):
+        self._offsets.close()
+        self._blob.close()
+
+
+class ColumnarWriter(object):
+    """Write models of one controller class to a new columnar store.
+
+    Existing files of the store are replaced. The store can only be read
+    once the writer is closed; if the `with` block raises, the columns are
+    closed without metadata, so the partial store cannot be opened.
+
+    Init Params:
+        path -- Store directory; created if missing.
+        ctrl_cls -- Controller class; its `MODEL_RULES` define the columns.
+
+    Public Methods:
+        append -- Write one model.
+        extend -- Write many models.
+        close -- Flush columns and write the metadata.
+
+    :raises ValueError if a `DataModel` key is not a Python identifier (keys
+        are used as file names).
+    """
+
+    def __init__(self, path, ctrl_cls):
+        self._layouts = dict((key, _layout(rule.type)) for key, rule
+                             in DataModel(ctrl_cls.MODEL_RULES)
+                             .rules.iteritems())
+        for key in self._layouts:
+            if not _KEY.match(key):
+                raise ValueError('Columnar store requires identifier '
+                                 'DataModel keys: %r' % key)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        elif os.path.exists(os.path.join(path, 'meta.json')):
+            # Until closed, the data files do not match the old metadata.
+            os.remove(os.path.join(path, 'meta.json'))
+        self._path = path
+        self._cls = ctrl_cls
+        self._columns = {}
+        for key, layout in self._layouts.iteritems():
+            base = os.path.join(path, key)
+            if layout in _FIXED:
+                self._columns[key] = _FixedWriter(base + '.col',
+                                                  _FIXED[layout])
+            else:
+                self._columns[key] = _VarWriter(base, _encoder(layout))
+        self._versions = _FixedWriter(os.path.join(path, _VERSIONS), 'q')
+        self._count = 0
+
+    def append(self, model):
+        """Write one model.
+
+        All values are read and encoded before any is written, so a model
+        that raises leaves the store unchanged.
+
+        :param model: DataModel -- A model following the class's rules.
+        :raises KeyError if the model lacks a key.
+        :raises struct.error if a value does not fit its column.
+        """
+        row = [(column, column.encode(model[key]))
+               for key, column in self._columns.iteritems()]
+        version = self._versions.encode(model.version)
+        for column, value in row:
+            column.write(value)
+        self._versions.write(version)
+        self._count += 1
+
+    def extend(self, models):
+        for model in models:
+            self.append(model)
+
+    def _close_columns(self):
+        for column in self._columns.itervalues():
+            column.close()
+        self._versions.close()
+
+    def close(self):
+        self._close_columns()
+        with open(os.path.join(self._path, 'meta.json'), 'w') as f:
+            json.dump({'class': self._cls.__name__, 'count': self._count,
+                       'columns': self._layouts}, f, indent=2,
+                      sort_keys=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_columns()
+
+
+def _map(path):
+    """Read-only memory map of a file; empty files map to ''."""
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@abstract_class
+class Column(object):
+    """Read-only view of one key's values.
+
+    Values are read from the mapped file on access; nothing is loaded up
+    front. Subclasses implement `__getitem__` and `_chunks`, which yields
+    lists/tuples of consecutive values.
+
+    Public Methods:
+        sum -- Sum of all values.
+        min -- Smallest value.
+        max -- Largest value.
+        where -- Row numbers of values matching a predicate.
+    """
+
+    def __init__(self, count):
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def _index(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('Column index out of range: %d' % i)
+        return i
+
+    def __iter__(self):
+        for chunk in self._chunks():
+            for value in chunk:
+                yield value
+
+    def sum(self):
+        return sum(sum(chunk) for chunk in self._chunks())
+
+    def min(self):
+        """:raises ValueError if the column is empty."""
+        return min(min(chunk) for chunk in self._chunks())
+
+    def max(self):
+        """:raises ValueError if the column is empty."""
+        return max(max(chunk) for chunk in self._chunks())
+
+    def where(self, predicate):
+        """Row numbers of values matching a predicate.
+
+        :param predicate: callable (value) -> bool
+        :return: list -- Row numbers, ascending.
+        """
+        rows = []
+        row = 0
+        for chunk in self._chunks():
+            rows.extend(row + i for i, value in enumerate(chunk)
+                        if predicate(value))
+            row += len(chunk)
+        return rows
+
+
+class _FixedColumn(Column):
+
+    def __init__(self, buf, code, count):
+        super(_FixedColumn, self).__init__(count)
+        self._buf = buf
+        self._code = code
+        self._item = struct.Struct('<' + code)
+
+    def __getitem__(self, i):
+        return self._item.unpack_from(self._buf,
+                                      self._index(i) * self._item.size)[0]
+
+    def _chunks(self):
+        size = self._item.size
+        for start in range(0, self._count, _CHUNK):
+            n = min(_CHUNK, self._count - start)
+            yield struct.unpack_from('<%d%s' % (n, self._code), self._buf,
+                                     start * size)
+
+
+class _VarColumn(Column):
+
+    def __init__(self, offsets, blob, decode):
+        super(_VarColumn, self).__init__(len(offsets) - 1)
+        self._offsets = offsets
+        self._blob = blob
+        self._decode = decode
+
+    def __getitem__(self, i):
+        i = self._index(i)
+        value = self._blob[self._offsets[i]:self._offsets[i + 1]]
+        return value if self._decode is None else self._decode(value)
+
+    def _chunks(self):
+        blob, decode = self._blob, self._decode
+        previous = None
+        for offsets in self._offsets._chunks():
+            if previous is not None:
+                offsets = (previous,) + offsets
+            values = [blob[offsets[i]:offsets[i + 1]]
+                      for i in range(len(offsets) - 1)]
+            if decode is not None:
+                values = [decode(value) for value in values]
+            previous = offsets[-1]
+            yield values
+
+
+class ColumnarStore(object):
+    """Read a columnar store written by `ColumnarWriter`.
+
+    Init Params:
+        path -- Store directory.
+        ctrl_cls -- Controller class the store was written for.
+
+    Public Methods:
+        keys -- Stored `DataModel` keys.
+        column -- Get the `Column` of a key.
+        load -- Rehydrate one record into a `DataModel`.
+        close -- Unmap all files.
+
+    :raises ValueError if the store was written for another class.
+    """
+
+    def __init__(self, path, ctrl_cls):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta['class'] != ctrl_cls.__name__:
+            raise ValueError('Columnar store at `%s` holds `%s`, not `%s`.' %
+                             (path, meta['class'], ctrl_cls.__name__))
+        self._cls = ctrl_cls
+        self._count = meta['count']
+        self._maps = []
+        self._columns = {}
+        for key, layout in meta['columns'].items():
+            base = os.path.join(path, key)
+            if layout in _FIXED:
+                self._columns[str(key)] = _FixedColumn(
+                    self._map(base + '.col'), _FIXED[layout], self._count)
+            else:
+                offsets = _FixedColumn(self._map(base + '.off'), 'q',
+                                       self._count + 1)
+                self._columns[str(key)] = _VarColumn(
+                    offsets, self._map(base + '.blob'), _decoder(layout))
+        self._versions = _FixedColumn(
+            self._map(os.path.join(path, _VERSIONS)), 'q', self._count)
+
+    def _map(self, path):
+        buf = _map(path)
+        self._maps.append(buf)
+        return buf
+
+    def __len__(self):
+        return self._count
+
+    def keys(self):
+        return list(self._columns)
+
+    def column(self, key):
+        """Get the `Column` of a key.
+
+        :raises KeyError for unknown keys.
+        """
+        return self._columns[key]
+
+    def load(self, i):
+        """Rehydrate one record.
+
+        :param i: int -- Row number.
+        :return: DataModel -- With the record's data and stored version.
+        """
+        data = dict((key, column[i])
+                    for key, column in self._columns.iteritems())
+        return DataModel(self._cls.MODEL_RULES, data=data,
+                         version=self._versions[i])
+
+    def close(self):
+        for buf in self._maps:
+            if buf:
+                buf.close()
+        del self._maps[:]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -8,6 +8,8 @@ one-way data-binding.
 Exports:
     :class Collection -- Used for type definition in the `DataModel` rule-set
         to track deep data members such as `dict` and `list`.
+    :class Derived -- Used in place of a binding in the `DataModel` rule-set
+        for keys computed from other `DataModel` keys.
     :class DataModel -- The read-only data-model passed to controller
         event-listeners. This model contains a read-only, storage-ready
         representation of the Pythonic data on the controller. This
@@ -17,10 +19,34 @@ Exports:
         inherit from this.
 """
 
-from bson.binary import Binary
-from core.decorators import classproperty, abstract_class
-import dill as pickle
-from combomethod import combomethod
+from core.decorators import (classproperty, cached_classproperty,
+                             abstract_class, combomethod)
+from core.exceptions import ConflictError
+from core import instrument
+
+
+# `dill` and `bson` are only needed to (de)serialize rules, and `dill` in
+#   particular is slow to import, so both are imported on first use.
+_dill = None
+_Binary = None
+
+
+def _pickle():
+    """Return the `dill` module, importing it on first use."""
+    global _dill
+    if _dill is None:
+        import dill
+        _dill = dill
+    return _dill
+
+
+def _binary():
+    """Return `bson.binary.Binary`, importing it on first use."""
+    global _Binary
+    if _Binary is None:
+        from bson.binary import Binary
+        _Binary = Binary
+    return _Binary
 
 
 @abstract_class
@@ -46,12 +72,12 @@ class Collection(object):
     """
 
     # noinspection PyMethodParameters,PyPep8Naming
-    @classproperty
+    @cached_classproperty
     def List(cls):
         return CollectionList
 
     # noinspection PyMethodParameters,PyPep8Naming
-    @classproperty
+    @cached_classproperty
     def Dict(cls):
         return CollectionDict
 
@@ -63,19 +89,59 @@ class Collection(object):
         self.subtype = subtype
 
 
+class Derived(object):
+    """Binding for a `DataModel` key computed from other `DataModel` keys.
+
+    The rule's operation is called with the current values of the
+    dependency keys, in the given order, whenever any of them changes.
+    Derived keys may depend on other derived keys; dependencies must not
+    form a cycle.
+
+    Init Params:
+        keys - One or more `DataModel` keys the value is derived from.
+
+    Usage:
+        MODEL_RULES = {
+            'price': ('price', float, None),
+            'qty': ('qty', int, None),
+            'total': (Derived('price', 'qty'), float,
+                      lambda price, qty: price * qty),
+            'label': (Derived('total'), str, lambda total: '$%.2f' % total)}
+    """
+
+    def __init__(self, *keys):
+        if not keys:
+            raise ValueError('Derived key requires at least one dependency.')
+        self.keys = keys
+
+    def __repr__(self):
+        return 'Derived' + repr(self.keys)
+
+
+def _derived_default(*values):
+    """Default derived operation: the single dependency value, or a tuple
+    of the dependency values."""
+    return values[0] if len(values) == 1 else values
+
+
 class Rule(object):
     """Holds data for individual binding rule.
 
     Properties:
         :type self.type: type | Collection | None -- Used for enforcement
             of strict typing within `DataModel`.
-        :type self.binding: str | None -- The name of the attribute on the
-            controller to which the `DataModel` key is bound. If None, key
-            is bound to controller instance.
+        :type self.binding: str | Derived | None -- The name of the attribute
+            on the controller to which the `DataModel` key is bound. If None,
+            key is bound to controller instance.
+        :type self.derived: tuple | None -- The `DataModel` keys a derived
+            key depends on; None for keys bound to the controller.
         :type self.operation: callable (mixed) -> mixed -- Function rule for
             converting data from controller attribute into form accepted by
             `DataModel` key.
     """
+
+    _derived = None
+
     @classmethod
     def default_operation(cls, scope):
         """Mapping function to use for key value if none defined.
@@ -87,16 +153,24 @@ class Rule(object):
     def __init__(self, binding, datatype, operation):
         """Rule init
 
-        :param binding: str | list | None -- Name of bound Controller
-            attribute(s). If None value will be bound to root controller
+        :param binding: str | list | Derived | None -- Name of bound
+            Controller attribute(s), or the `DataModel` keys the value is
+            derived from. If None value will be bound to root controller
             instance.
         :param datatype: type | Collection | None -- Type rule for value.
             If None value will have no type restriction.
         :param operation: None | callable (mixed) -> mixed -- Optional
-            mapping function that takes the bound attribute and produces
-            the value to be stored in the `DataModel`.
+            mapping function that takes the bound attribute (or, for derived
+            keys, the dependency values) and produces the value to be stored
+            in the `DataModel`.
         """
         self._binding, self._type = binding, datatype
+        if isinstance(binding, Derived):
+            if _collection_kind(datatype):
+                raise TypeError('Derived keys cannot be of Collection type.')
+            self._derived = binding.keys
+            if operation is None:
+                operation = _derived_default
         if operation is None:
             operation = self.__class__.default_operation
         self._operation = operation
@@ -107,11 +181,41 @@ class Rule(object):
     @property
     def binding(self): return self._binding
 
+    @property
+    def derived(self): return self._derived
+
     @property
     def operation(self): return self._operation
 
     def pickle(self):
-        return pickle.dumps(self)
+        return _pickle().dumps(self)
+
+
+def _collection_kind(datatype):
+    """Resolve a rule type to `CollectionList`, `CollectionDict` or None.
+
+    :param datatype: type | Collection | None -- Rule type.
+    :return: type | None
+    """
+    for kind in (CollectionList, CollectionDict):
+        if (isinstance(datatype, kind) or
+                (isinstance(datatype, type) and issubclass(datatype, kind))):
+            return kind
+    return None
+
+
+def _same_value(old, new):
+    """Whether storing `new` over `old` leaves a model key unchanged.
+
+    The same list, dict or set object may have been modified in place, so
+    it always counts as a change.
+    """
+    if old is new:
+        return not isinstance(new, (list, dict, set))
+    try:
+        return type(old) is type(new) and bool(old == new)
+    except Exception:
+        return False
 
 
 class DataModel(object):
@@ -136,15 +240,24 @@ class DataModel(object):
             should be provided.
         rules - (Optional) existing rules to load.
         data - (Optional) existing data to load.
+        version - (Optional) stored version of the existing data.
 
     Properties:
         :type rules: dict -- Collection of `Rule`s.
         :type bson_rules: dict -- A mongo-ready collection of rules.
+        :type version: int -- Bumped by every change to a value.
+        :type saved_version: int -- The version last saved to (or loaded
+            from) the data store; compare-and-set saves expect the store to
+            still hold it.
 
     Public Methods:
         update_key - Update model for given key.
         update_all - Update model for all keys.
         update_from_binding - Update all model keys associated with binding.
+        update_dependents - Recompute derived keys affected by changed keys.
+        affected_keys - Derived keys affected by changed keys.
+        changes -- Keys changed since the last save, with their values.
+        mark_saved -- Mark the model as in sync with the data store.
         iteritems -- Key, Value iterator for data.
         iterkeys -- Key iterator for data.
         itervalues -- Value iterator for data.
@@ -159,15 +272,17 @@ class DataModel(object):
         return cls.none_instance
 
     @classmethod
-    def load(cls, bson_rules, model_data):
+    def load(cls, bson_rules, model_data, version=0):
         """Load DataModel from existing data.
 
         :param bson_rules: dict -- BSON-format rules collection.
         :param model_data: dict -- Initializing data.
+        :param version: int -- Stored version of the data.
         :return: DataModel
         """
+        pickle = _pickle()
         rules = dict([(k, pickle.loads(str(v))) for k, v in bson_rules.iteritems()])
-        return cls(None, rules, model_data)
+        return cls(None, rules, model_data, version)
 
     @property
     def rules(self):
@@ -175,26 +290,81 @@ class DataModel(object):
 
     @property
     def bson_rules(self):
+        Binary = _binary()
         return dict([(k, Binary(v.pickle())) for k, v in self.__rules.iteritems()])
 
-    def __init__(self, ruleset, rules=None, data=None):
+    @property
+    def version(self):
+        return self.__version
+
+    @property
+    def saved_version(self):
+        return self.__saved_version
+
+    def __init__(self, ruleset, rules=None, data=None, version=0):
         """DataModel init
 
         :param rules: dict -- The rule-set for each DataModel key.
+        :param version: int -- Stored version of `data`.
 
         :raises NameError if rules contain data-key sharing the name of an
-            existing member.
+            existing member, or a derived key depending on an unknown key.
+        :raises ValueError if derived keys depend on each other cyclically.
         """
         self.__locked = False
         self.__data = data or {}
         self.__rules = rules or {}
+        self.__version = self.__saved_version = version
+        self.__dirty = set()
         if not self.__rules:
             for key, val in ruleset.iteritems():
-                if hasattr(self, key):
+                if hasattr(self.__class__, key):
                     raise NameError('Invalid DataModel key name: ' + key)
                 self.__rules[key] = Rule(*val)
+        self.__build_graph()
         self.__locked = True
 
+    def __build_graph(self):
+        """Build the derived key dependency DAG.
+
+        Sets `__dependents` (key -> derived keys directly depending on it),
+        `__derived` (derived keys in topological order) and `__rank` (derived
+        key -> position in that order).
+        """
+        dependents = {}
+        pending = {}
+        for key, rule in self.__rules.iteritems():
+            if not rule.derived:
+                continue
+            pending[key] = 0
+            for dep in rule.derived:
+                if dep not in self.__rules:
+                    raise NameError('Derived DataModel key `' + key +
+                                    '` depends on unknown key: ' + dep)
+                dependents.setdefault(dep, []).append(key)
+        # Kahn's algorithm; a derived key is ready once all of the derived
+        #   keys it depends on have been ordered.
+        for dep, keys in dependents.iteritems():
+            if dep in pending:
+                for key in keys:
+                    pending[key] += 1
+        ready = sorted(k for k, n in pending.iteritems() if not n)
+        order = []
+        while ready:
+            key = ready.pop()
+            order.append(key)
+            for dependent in dependents.get(key, ()):
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    ready.append(dependent)
+        if len(order) < len(pending):
+            raise ValueError('Derived DataModel keys form a cycle: ' +
+                             ', '.join(sorted(k for k, n in pending.iteritems()
+                                              if n)))
+        self.__dependents = dependents
+        self.__derived = order
+        self.__rank = dict((k, i) for i, k in enumerate(order))
+
     def update_key(self, ref, key, instruction=None):
         """Update the value for the given key.
 
@@ -205,9 +375,10 @@ class DataModel(object):
             re-assigned / re-generated.
             Expected Keys For Collection.List:
                 :key action: str -- The instruction type. Always required.
-                    Possible values consist of 'remove', 'append' and 'insert'.
+                    Possible values consist of 'remove', 'append', 'insert'
+                    and 'set' (replace the item at `index`).
                 :key index: int -- The index of item affected by the action.
-                    Required with actions 'remove' and 'insert'.
+                    Required with actions 'remove', 'insert' and 'set'.
             Expected Keys For Collection.Dict:
                 :key action: str -- The instruction type. Always required.
                     Possible values consist of 'remove', and 'add'.
@@ -219,96 +390,176 @@ class DataModel(object):
         :raises TypeError if updated value does not conform to the defined
             type rules.
         """
-        if key in self.__rules:
-            rule = self.__rules[key]
-            value = ref
-            operation = rule.operation
-            if rule.binding:
-                value = getattr(ref, rule.binding)
-            if rule.type:
-                if (isinstance(rule.type, Collection) or
-                        (type(rule.type) is type and
-                         issubclass(rule.type, Collection))):
-                    subtype = rule.type.subtype
-                    if (isinstance(rule.type, Collection.List) or
-                            (type(rule.type) is type and
-                             issubclass(rule.type, Collection.List))):
-                        if instruction:
-                            if instruction['action'] == 'remove':
-                                item = self.__data[key][instruction['index']]
-                                self.__data[key].remove(item)
-                            elif instruction['action'] == 'append':
-                                item = operation(value[len(value)-1])
-                                if subtype and not isinstance(item, subtype):
-                                    raise TypeError('Item of invalid type '
-                                                    'in collection: ' + key)
-                                self.__data[key].append(item)
-                            elif instruction['action'] == 'insert':
-                                item = operation(value[instruction['index']])
-                                if subtype and not isinstance(item, subtype):
-                                    raise TypeError('Item of invalid type '
-                                                    'in collection: ' + key)
-                                self.__data[key].insert(instruction['index'],
-                                                       item)
-                            else:
-                                raise ValueError(
-                                    'collection.list cannot handle instruction'
-                                    ' type: ' + instruction['action'])
-                        else:
-                            if not isinstance(value, list):
-                                raise TypeError('Datamodel expected value with'
-                                                ' type `list` for collection'
-                                                ': ' + key)
-                            for x in value:
-                                y = operation(x)
-                                if subtype and not isinstance(y, subtype):
-                                    raise TypeError('Item of invalid type '
-                                                    'in collection: ' + key)
-                            self.__data[key] = [operation(x) for x in value]
-
-                    elif (isinstance(rule.type, Collection.Dict) or
-                          (type(rule.type) is type and
-                           issubclass(rule.type, Collection.Dict))):
-                        if instruction:
-                            if instruction['action'] == 'remove':
-                                del self.__data[key][instruction['key']]
-                            elif instruction['action'] == 'add':
-                                item = operation(value[instruction['key']])
-                                if subtype and not isinstance(item, subtype):
-                                    raise TypeError('Item of invalid type '
-                                                    'in collection: ' + key)
-                                self.__data[key][instruction['key']] = item
-                            else:
-                                raise ValueError(
-                                    'collection.dict cannot handle instruction'
-                                    ' type: ' + instruction['action'])
-                        else:
-                            if not isinstance(value, dict):
-                                raise TypeError('Datamodel expected value with'
-                                                ' type `dict` for collection'
-                                                ': ' + key)
-                            self.__data[key] = {}
-                            for k, v in value.iteritems():
-                                y = operation(v)
-                                if subtype and not isinstance(y, subtype):
-                                    raise TypeError('Item of invalid type '
-                                                    'in collection: ' + key)
-                                self.__data[k] = y
-                else:
-                    value = operation(value)
-                    if not isinstance(value, rule.type):
-                        raise TypeError('Datamodel expected value with type '
-                                        '`' + rule.type.__name__ + '` for key: ' + key)
-                    self.__data[key] = value
+        if key not in self.__rules:
+            raise AttributeError
+        rule = self.__rules[key]
+        start = instrument.clock() if instrument.ACTIVE else None
+        value = ref
+        operation = rule.operation
+        if rule.derived:
+            try:
+                value = [self.__data[dep] for dep in rule.derived]
+            except KeyError as e:
+                raise AttributeError('Derived DataModel key `' + key +
+                                     '` depends on unset key: ' + e.args[0])
+        elif rule.binding:
+            value = getattr(ref, rule.binding)
+        kind = _collection_kind(rule.type)
+        action = instruction['action'] if instruction else None
+
+        # Evaluate
+        items = ()
+        if kind is CollectionList:
+            if action == 'remove':
+                result = None
+            elif action == 'append':
+                result = operation(value[len(value)-1])
+                items = (result,)
+            elif action in ('insert', 'set'):
+                result = operation(value[instruction['index']])
+                items = (result,)
+            elif action:
+                raise ValueError('collection.list cannot handle instruction'
+                                 ' type: ' + action)
             else:
-                self.__data[key] = operation(value)
+                if not isinstance(value, list):
+                    raise TypeError('Datamodel expected value with type '
+                                    '`list` for collection: ' + key)
+                result = items = [operation(x) for x in value]
+        elif kind is CollectionDict:
+            if action == 'remove':
+                result = None
+            elif action == 'add':
+                result = operation(value[instruction['key']])
+                items = (result,)
+            elif action:
+                raise ValueError('collection.dict cannot handle instruction'
+                                 ' type: ' + action)
+            else:
+                if not isinstance(value, dict):
+                    raise TypeError('Datamodel expected value with type '
+                                    '`dict` for collection: ' + key)
+                result = dict((k, operation(v)) for k, v in value.iteritems())
+                items = result.itervalues()
+        elif rule.derived:
+            result = operation(*value)
         else:
-            raise AttributeError
+            result = operation(value)
+        if start is not None:
+            instrument.record('rule', ref.__class__.__name__, key, start)
+            start = instrument.clock()
+
+        # Validate
+        if kind:
+            subtype = rule.type.subtype
+            if subtype:
+                for item in items:
+                    if not isinstance(item, subtype):
+                        if start is not None:
+                            instrument.incr('validate_error',
+                                            ref.__class__.__name__, key)
+                        raise TypeError('Item of invalid type in '
+                                        'collection: ' + key)
+        elif rule.type and not isinstance(result, rule.type):
+            if start is not None:
+                instrument.incr('validate_error', ref.__class__.__name__,
+                                key)
+            raise TypeError('Datamodel expected value with type `' +
+                            rule.type.__name__ + '` for key: ' + key)
+        if start is not None:
+            instrument.record('validate', ref.__class__.__name__, key,
+                              start)
+
+        # Apply
+        if kind is CollectionList and action == 'remove':
+            del self.__data[key][instruction['index']]
+        elif kind is CollectionList and action == 'append':
+            self.__data[key].append(result)
+        elif kind is CollectionList and action == 'insert':
+            self.__data[key].insert(instruction['index'], result)
+        elif kind is CollectionList and action == 'set':
+            self.__data[key][instruction['index']] = result
+        elif kind is CollectionDict and action == 'remove':
+            del self.__data[key][instruction['key']]
+        elif kind is CollectionDict and action == 'add':
+            self.__data[key][instruction['key']] = result
+        else:
+            if key in self.__data and _same_value(self.__data[key], result):
+                self.__data[key] = result
+                return
+            self.__data[key] = result
+        # Counters are written through `__dict__` so that the read-only
+        #   `__setattr__` is bypassed on this hot path.
+        self.__dict__['_DataModel__version'] += 1
+        self.__dirty.add(key)
+
+    def _commit(self, values):
+        """Store values that were already evaluated and validated.
+
+        Used by the setters generated by `core.codegen`; `update_key` is
+        the general path.
+
+        :param values: dict -- Keys mapped to their new values.
+        """
+        data = self.__data
+        changed = [k for k, v in values.iteritems()
+                   if k not in data or not _same_value(data[k], v)]
+        data.update(values)
+        self.__dict__['_DataModel__version'] += len(changed)
+        self.__dirty.update(changed)
+
+    def changes(self):
+        """Keys updated since the last save, mapped to their current values.
+
+        :return: dict
+        """
+        return dict((k, self.__data[k]) for k in self.__dirty
+                    if k in self.__data)
+
+    def mark_saved(self, version=None):
+        """Mark the model as saved to the data store.
+
+        :param version: int | None -- The version that was stored; defaults
+            to the current version. If the model has been updated since
+            (e.g. concurrently with a background save), its changes are
+            kept as unsaved.
+        """
+        if version is None or version == self.__version:
+            self.__dict__['_DataModel__saved_version'] = self.__version
+            self.__dirty.clear()
+        else:
+            self.__dict__['_DataModel__saved_version'] = version
+
+    def _reset(self, data, version):
+        """Replace all data with stored data, in sync at `version`.
+
+        :param data: dict -- Stored keys and values.
+        :param version: int -- The stored version.
+        """
+        self.__data.clear()
+        self.__data.update(data)
+        self.__dict__['_DataModel__version'] = version
+        self.__dict__['_DataModel__saved_version'] = version
+        self.__dirty.clear()
+
+    def _sync_state(self):
+        """Saved version and unsaved keys, for `_restore_sync_state`."""
+        return self.__saved_version, frozenset(self.__dirty)
+
+    def _restore_sync_state(self, state):
+        """Undo `mark_saved` calls after the save they recorded was rolled
+        back by the data store. Keys updated since `state` stay unsaved.
+
+        :param state: tuple -- As returned by `_sync_state`.
+        """
+        self.__dict__['_DataModel__saved_version'] = state[0]
+        self.__dirty.update(state[1])
 
     def update_all(self, ref):
         """Update entire model.
 
-        Calls `update_key` for every key in the rule set.
+        Calls `update_key` for every key in the rule set; derived keys are
+        updated last, in dependency order.
 
         :param ref: DataModelController -- The controller instance.
 
@@ -316,7 +567,43 @@ class DataModel(object):
             type rules.
         """
         for key, val in self.__rules.iteritems():
+            if not val.derived:
+                self.update_key(ref, key)
+        for key in self.__derived:
+            self.update_key(ref, key)
+
+    def affected_keys(self, keys):
+        """Derived keys that depend, directly or not, on the given keys.
+
+        :param keys: iterable -- Changed `DataModel` keys.
+        :return: list -- Derived keys in dependency (topological) order.
+        """
+        dependents = self.__dependents
+        if not dependents:
+            return []
+        affected = set()
+        stack = [k for k in keys if k in dependents]
+        while stack:
+            for dependent in dependents.get(stack.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    stack.append(dependent)
+        return sorted(affected, key=self.__rank.__getitem__)
+
+    def update_dependents(self, ref, keys):
+        """Recompute the derived keys affected by changes to the given keys.
+
+        Each affected key is recomputed exactly once, after all of its
+        dependencies.
+
+        :param ref: DataModelController -- The controller instance.
+        :param keys: iterable -- Changed `DataModel` keys.
+        :return: list -- Recomputed derived keys.
+        """
+        affected = self.affected_keys(keys)
+        for key in affected:
             self.update_key(ref, key)
+        return affected
 
     def get_bindings_for_key(self, key):
         """Return all property names bound to key.
@@ -336,9 +623,11 @@ class DataModel(object):
         keys = set()
         if not bound_attr_name:
             self.update_all(ref)
-            keys = set(self.__rules.keys())
+            return set(self.__rules.keys())
         elif isinstance(bound_attr_name, (list, set, tuple)):
             for key, val in self.__rules.iteritems():
+                if val.derived:
+                    continue
                 if (not val.binding or val.binding in bound_attr_name or
                     (isinstance(val.binding, (list, set, tuple)) and
                      bool([x for x in val.binding if x in bound_attr_name]))):
@@ -346,11 +635,15 @@ class DataModel(object):
                     keys.add(key)
         else:
             for key, val in self.__rules.iteritems():
+                if val.derived:
+                    continue
                 if (not val.binding or val.binding in bound_attr_name or
                     (isinstance(val.binding, (list, set, tuple)) and
                      bound_attr_name in val.binding)):
                     self.update_key(ref, key, None)
                     keys.add(key)
+        if self.__dependents:
+            keys.update(self.update_dependents(ref, keys))
         return keys
 
     def __getattr__(self, key):
@@ -363,7 +656,7 @@ class DataModel(object):
         return self.__data[key]
 
     def __setattr__(self, key, value):
-        if hasattr(self, '_locked') and self.__locked:
+        if self.__dict__.get('_DataModel__locked'):
             raise ValueError('Cannot change values from read-only proxy.')
         else:
             super(DataModel, self).__setattr__(key, value)
@@ -392,6 +685,13 @@ class DataModel(object):
         return self.iteritems()
 
 
+class _Hook(tuple):
+    """Listener `(func, args)` added by core internals (e.g. `core.index`)
+    through `DataModelController._add_hook`. Removing a key's listeners
+    without naming `func` leaves hooks in place."""
+    pass
+
+
 @abstract_class
 class DataModelController(object):
     """Controller for `DataModel`.
@@ -409,6 +709,17 @@ class DataModelController(object):
             type, and an optional mapping function, respectively.
         :type INIT_DEFAULTS: dict -- Default values for __init__ params.
 
+        Both return a new dict on every access, which subclasses may extend
+        in place. Subclasses may override either with a `classproperty`, or
+        with a `cached_classproperty` when the returned values are never
+        mutated (a cached INIT_DEFAULTS hands the same default objects to
+        every instance).
+
+        `new` reads MODEL_RULES once per class and shares the parsed rules
+        between the models it creates; call
+        `invalidate_classproperty(cls, '_model_rules')` if a class's
+        MODEL_RULES change afterwards.
+
     Class Methods:
         load -- Load a controller instance by uid.
         new -- Create new controller instance.
@@ -432,6 +743,16 @@ class DataModelController(object):
         _call_listener -- Fire event listeners for the given bound attribute
             name(s).
 
+    Nested Controllers:
+        Controllers held in a `Collection` key (bound to a single attribute)
+        are linked to their parent whenever the key is updated. A change to
+        a child's model then patches only that child's element of the
+        parent collection, fires the parent's listeners for the collection
+        key with a scoped `path` in the instruction (e.g.
+        `{'action': 'set', 'index': 3, 'path': 'records[3].lastname'}`;
+        dict collections use action 'add' with 'key'), and bubbles up
+        through the parent's own parents, so each change costs O(depth).
+
     Usage:
         class MyController(DataModelController):
             def __init__(self):
@@ -503,6 +824,10 @@ class DataModelController(object):
         gene.model.lastname = 'Belcher' #-> ValueError (Cannot change values from read-only proxy.)
     """
 
+    # Set per instance by `persist.WriteBehindQueue.attach`; the queue is
+    #   notified after every model update.
+    _write_behind = None
+
     @classproperty
     def MODEL_RULES(cls):
         """Rules for the underlying data model.
@@ -515,6 +840,13 @@ class DataModelController(object):
             '_collection': (None, str, lambda x: x.__class__.__name__)
         }
 
+    # noinspection PyMethodParameters
+    @cached_classproperty
+    def _model_rules(cls):
+        """`MODEL_RULES` parsed into `Rule`s. Models never modify their
+        rules, so one dict is shared by every model `new` creates."""
+        return DataModel(cls.MODEL_RULES).rules
+
     @classproperty
     def INIT_DEFAULTS(cls):
         """Default values for initialization parameters.
@@ -529,13 +861,41 @@ class DataModelController(object):
     # noinspection PyMethodParameters
     @combomethod
     def save(rec, data_store, uid=None):
-        """Save DataModel to permanent storage."""
+        """Save DataModel to permanent storage.
+
+        If the data store implements `compare_and_save(cls, model,
+        expected_version)`, the save only succeeds while the store still
+        holds the model's `saved_version`. Stores may return the version
+        they wrote; otherwise the version at the start of the save is
+        assumed.
+
+        :raises ConflictError if the stored version has changed since the
+            model was loaded or last saved.
+        """
         if isinstance(rec, DataModelController):
-            data_store.save(rec.__class__, rec.model)
+            start = instrument.clock() if instrument.ACTIVE else None
+            model = rec.model
+            version = model.version
+            compare_and_save = getattr(data_store, 'compare_and_save', None)
+            if compare_and_save is None:
+                written = data_store.save(rec.__class__, model)
+            else:
+                try:
+                    written = compare_and_save(rec.__class__, model,
+                                               model.saved_version)
+                except ConflictError:
+                    if instrument.ACTIVE:
+                        instrument.incr('conflict', rec.__class__.__name__,
+                                        'save')
+                    raise
+            model.mark_saved(version if written is None else written)
+            if start is not None:
+                instrument.record('store', rec.__class__.__name__, 'save',
+                                  start)
         else:
             if not uid:
                 raise ValueError("`uid` param required for classmethod.")
-            ctrl = rec.get(uid, data_store)
+            ctrl = rec.get(data_store, uid)
             ctrl.save(data_store)
 
     # noinspection PyMethodParameters
@@ -543,7 +903,11 @@ class DataModelController(object):
     def delete_cache(rec, data_store, uid=None):
         """Delete controller from cache."""
         if isinstance(rec, DataModelController):
+            start = instrument.clock() if instrument.ACTIVE else None
             data_store.delete_controller(rec.__class__, rec.uid)
+            if start is not None:
+                instrument.record('store', rec.__class__.__name__,
+                                  'delete_controller', start)
         else:
             if not uid:
                 raise ValueError("`uid` param required for classmethod.")
@@ -555,7 +919,11 @@ class DataModelController(object):
         """Delete controller and datamodel from all storage."""
         if isinstance(rec, DataModelController):
             rec.delete_cache(data_store)
+            start = instrument.clock() if instrument.ACTIVE else None
             data_store.delete_model(rec.__class__, rec.uid)
+            if start is not None:
+                instrument.record('store', rec.__class__.__name__,
+                                  'delete_model', start)
         else:
             if not uid:
                 raise ValueError("`uid` param required for classmethod.")
@@ -576,7 +944,12 @@ class DataModelController(object):
         :return: DataModelController -- Existing controller instance if stored,
             otherwise new controller instance for existing data model.
         """
-        return data_store.get_controller(cls, uid)
+        if not instrument.ACTIVE:
+            return data_store.get_controller(cls, uid)
+        start = instrument.clock()
+        ctrl = data_store.get_controller(cls, uid)
+        instrument.record('store', cls.__name__, 'load', start)
+        return ctrl
 
     @classmethod
     def restore(cls, data_store, data_model, **kwargs):
@@ -602,7 +975,7 @@ class DataModelController(object):
             instance.
         :return: DataModelController -- New controller instance.
         """
-        data_model = DataModel(cls.MODEL_RULES)
+        data_model = DataModel({}, cls._model_rules)
         if data_store:
             kwargs['uid'] = data_store.uid(cls)
         return cls(data_model, data_store, **kwargs)
@@ -617,12 +990,18 @@ class DataModelController(object):
             instance.
         """
         rules = data_model.rules
-        defaults = self.__class__.INIT_DEFAULTS
+        defaults = dict(self.__class__.INIT_DEFAULTS)
         self.__listeners = {}
         self.__bindings = []
+        self.__collections = {}
+        self.__children = {}
+        self.__parents = {}
         for k, v in rules.iteritems():
-            if v.binding:
+            if v.binding and not v.derived:
                 self.__bindings.append(v.binding)
+                kind = _collection_kind(v.type)
+                if kind and isinstance(v.binding, str):
+                    self.__collections[k] = (v.binding, kind)
         self.__keys = [k for k in rules.iterkeys()]
         self.__model = data_model
         self._data_store = data_store
@@ -647,6 +1026,9 @@ class DataModelController(object):
         if key not in self.__keys:
             raise ValueError("Key does not exist in DataModel.")
         attr_name = self.model.get_bindings_for_key(key)
+        if isinstance(attr_name, Derived):
+            raise ValueError("Key `" + key + "` is derived and has no bound "
+                             "property.")
         # If more than one binding for key, this only gets the first property
         #   binding in the list. This could cause potential logic problems
         #   in the future and should be dealt with eventually.
@@ -707,19 +1089,51 @@ class DataModelController(object):
         else:
             raise ValueError("Key `" + key + "` does not exist in DataModel.")
 
-    def off_change(self, key):
+    def off_change(self, key, func=None):
         """Remove listeners for given DataModel key(s).
 
+        Listeners that core modules add to keep derived state current (e.g.
+        `core.index.IndexManager`) are only removed when `func` names them.
+
         :param key: str | list -- If '*' all keys will be unbound from their
             respective listeners.
+        :param func: callable | None -- If given, only listeners equal to
+            `func` are removed.
         """
         if key == '*':
             key = self.__bindings
         if isinstance(key, (set, list, tuple)):
             for k in key:
-                self.off_change(k)
-        else:
-            del self.__listeners[key]
+                self.off_change(k, func)
+        elif func is None:
+            hooks = [listener for listener in self.__listeners[key]
+                     if isinstance(listener, _Hook)]
+            if hooks:
+                self.__listeners[key] = hooks
+            else:
+                del self.__listeners[key]
+        elif key in self.__listeners:
+            listeners = [listener for listener in self.__listeners[key]
+                         if listener[0] != func]
+            if listeners:
+                self.__listeners[key] = listeners
+            else:
+                del self.__listeners[key]
+
+    def _add_hook(self, key, func, args=None):
+        """Add an internal listener for a DataModel key.
+
+        Called like an `on_change` listener, but only removed by `off_change`
+        with `func` given.
+
+        :param key: str -- DataModel key.
+        :param func: callable (model, key, instruction, [args,...])
+        :param args: list | None
+        :raises ValueError if the key does not exist.
+        """
+        if key not in self.__keys:
+            raise ValueError("Key `" + key + "` does not exist in DataModel.")
+        self.__listeners.setdefault(key, []).append(_Hook((func, args)))
 
     def _update_model_collection(self, key, instruction):
         """Precise update of a `Collection`.
@@ -729,12 +1143,12 @@ class DataModelController(object):
         :param instruction: dict -- Instruction set. See docs for
             `DataModel.update_key`.
         """
-        if isinstance(key, (list, tuple, set)):
-            for k in key:
-                self.__model.update_key(self, k, instruction)
-        else:
-            self.__model.update_key(self, key, instruction)
-        self._call_listener(key, instruction)
+        keys = key if isinstance(key, (list, tuple, set)) else (key,)
+        for k in keys:
+            self.__model.update_key(self, k, instruction)
+            if k in self.__collections:
+                self._link_children(k, instruction)
+        self._changed(keys, instruction)
 
     def _update_model(self, bindings=None):
         """Update `DataModel` for given bound attribute name(s).
@@ -744,7 +1158,122 @@ class DataModelController(object):
         if bindings is None:
             bindings = self.__bindings
         keys = self.__model.update_from_binding(self, bindings)
-        self._call_listener(keys)
+        if self.__collections:
+            for key in keys:
+                if key in self.__collections:
+                    self._link_children(key)
+        self._changed(keys)
+
+    def _changed(self, keys, instruction=None):
+        """Handle updated `DataModel` keys.
+
+        Fires listeners, recomputes derived keys after a collection
+        instruction (full updates already include them), marks the
+        controller for its write-behind queue, if any, and notifies parent
+        controllers.
+
+        :param keys: list | set | tuple -- The updated keys.
+        :param instruction: dict | None -- Collection instruction, if any.
+        """
+        self._call_listener(keys, instruction)
+        if instruction:
+            derived = self.__model.update_dependents(self, keys)
+            if derived:
+                self._call_listener(derived)
+                keys = list(keys) + derived
+        if self._write_behind is not None:
+            self._write_behind.mark(self)
+        if self.__parents:
+            self._propagate_change(keys)
+
+    def _link_children(self, key, instruction=None):
+        """Link the controllers held in a collection key to this controller.
+
+        Appends and dict adds/removes only (re)link the affected element;
+        any other update relinks the whole collection.
+
+        :param key: str -- Collection key of the `DataModel`.
+        :param instruction: dict | None -- The applied collection instruction.
+        """
+        binding, kind = self.__collections[key]
+        value = getattr(self, binding)
+        links = self.__children.setdefault(key, {})
+        action = instruction['action'] if instruction else None
+        if kind is CollectionList and action == 'append':
+            self.__link(key, links, len(value) - 1, value[len(value) - 1])
+        elif kind is CollectionList and action == 'set':
+            self.__link(key, links, instruction['index'],
+                        value[instruction['index']])
+        elif kind is CollectionDict and action == 'add':
+            self.__link(key, links, instruction['key'],
+                        value[instruction['key']])
+        elif kind is CollectionDict and action == 'remove':
+            self.__unlink(key, links, instruction['key'])
+        elif action in ('insert', 'remove') and not links:
+            # Nothing linked whose position could shift.
+            if action == 'insert':
+                self.__link(key, links, instruction['index'],
+                            value[instruction['index']])
+        else:
+            link_id = (id(self), key)
+            for child in links.itervalues():
+                child.__parents.pop(link_id, None)
+            links.clear()
+            items = (enumerate(value) if kind is CollectionList else
+                     value.iteritems())
+            for pos, child in items:
+                if isinstance(child, DataModelController):
+                    links[pos] = child
+                    child.__parents[link_id] = (self, key, pos)
+
+    def __link(self, key, links, pos, child):
+        self.__unlink(key, links, pos)
+        if isinstance(child, DataModelController):
+            links[pos] = child
+            child.__parents[(id(self), key)] = (self, key, pos)
+
+    def __unlink(self, key, links, pos):
+        child = links.pop(pos, None)
+        if child is not None:
+            child.__parents.pop((id(self), key), None)
+
+    def _propagate_change(self, paths):
+        """Notify parent controllers of changed keys.
+
+        :param paths: iterable -- Changed keys / paths, relative to this
+            controller.
+        """
+        for parent, key, pos in self.__parents.values():
+            parent._child_changed(key, pos, paths)
+
+    def _child_changed(self, key, pos, paths):
+        """Patch the element of a child controller that changed.
+
+        Only the child's element of the collection is re-evaluated. Listeners
+        for the collection key are fired once per changed path, with the
+        scoped path (e.g. 'records[3].lastname') in the instruction.
+
+        :param key: str -- Collection key holding the child.
+        :param pos: int | str -- Index or dict key of the child.
+        :param paths: iterable -- Changed paths, relative to the child.
+        """
+        if self.__collections[key][1] is CollectionList:
+            instruction = {'action': 'set', 'index': pos}
+        else:
+            instruction = {'action': 'add', 'key': pos}
+        self.__model.update_key(self, key, instruction)
+        scoped = ['%s[%r].%s' % (key, pos, path) for path in paths]
+        if key in self.__listeners:
+            for path in scoped:
+                self._call_listener(key, dict(instruction, path=path))
+        derived = self.__model.update_dependents(self, (key,))
+        if derived:
+            self._call_listener(derived)
+            scoped.extend(derived)
+        if self._write_behind is not None:
+            self._write_behind.mark(self)
+        if self.__parents:
+            self._propagate_change(scoped)
 
     def _call_listener(self, keys, instruction=None, kwargs=None):
         """ Call listener
@@ -761,6 +1290,7 @@ class DataModelController(object):
             for key in keys:
                 self._call_listener(key, instruction, kwargs)
         elif keys in self.__listeners:
+            start = instrument.clock() if instrument.ACTIVE else None
             for listener in self.__listeners[keys]:
                 if callable(listener[0]):
                     if listener[1]:
@@ -768,6 +1298,9 @@ class DataModelController(object):
                                     *listener[1])
                     else:
                         listener[0](self.model, keys, instruction)
+            if start is not None:
+                instrument.record('listener', self.__class__.__name__, keys,
+                                  start)
 
     def __setattr__(self, key, value):
         super(DataModelController, self).__setattr__(key, value)
@@ -8,14 +8,25 @@ Exports:
     :callable classproperty -- Decorator for a member function to behave like
         both a classmethod and a property. Accessible like property, but from
         the class, not an instance.
+    :callable cached_classproperty -- `classproperty` whose value is computed
+        once per owner class, with explicit invalidation.
+    :callable invalidate_classproperty -- Invalidate cached class property
+        values for a class and its subclasses.
+    :callable combomethod -- Decorator for a method callable from both the
+        class and its instances.
     :callable abstract_class -- Class decorator to designate class as not
         instantiable. Class is an abstract (or meta) class and is only designed
         to be inherited.
 """
 
+from types import MethodType
+
 from core.exceptions import InitError
 
 
+_MISSING = object()
+
+
 # METHOD DECORATORS
 
 
@@ -34,17 +45,132 @@ class classproperty(property):
         print MyClass.READ_ONLY_VALUE #-> "50"
     """
     def __get__(self, cls, owner):
-        return classmethod(self.fget).__get__(None, owner)()
+        return self.fget(owner)
+
+
+# noinspection PyPep8Naming
+class cached_classproperty(classproperty):
+    """`classproperty` that computes its value once per owner class.
+
+    Values are cached per accessing class, so a subclass inheriting the
+    property gets its own value rather than its parent's. The cached value
+    is shared by every caller: return immutable values, or copy before
+    mutating.
+
+    Usage:
+        class MyClass(object):
+            @cached_classproperty
+            def TABLE(cls):
+                return expensive_build(cls)
+        MyClass.TABLE # Built on first access, cached afterwards.
+        invalidate_classproperty(MyClass, 'TABLE') # Rebuilt on next access.
+    """
+    def __init__(self, *args, **kwargs):
+        super(cached_classproperty, self).__init__(*args, **kwargs)
+        self._cache = {}
+
+    def __get__(self, cls, owner):
+        value = self._cache.get(owner, _MISSING)
+        if value is _MISSING:
+            value = self._cache[owner] = self.fget(owner)
+        return value
+
+    def invalidate(self, owner=None):
+        """Drop cached values.
+
+        :param owner: type | None -- Drop values for this class and its
+            subclasses. If None, all cached values are dropped.
+        """
+        if owner is None:
+            self._cache.clear()
+        else:
+            for cls in [c for c in self._cache if issubclass(c, owner)]:
+                del self._cache[cls]
+
+
+# noinspection PyPep8Naming
+class combomethod(object):
+    """Decorator for a method callable from both the class and its instances.
+
+    The first argument receives the instance when called on one, otherwise
+    the class.
+
+    Usage:
+        class MyClass(object):
+            @combomethod
+            def describe(rec):
+                return 'instance' if isinstance(rec, MyClass) else 'class'
+        MyClass.describe() #-> "class"
+        MyClass().describe() #-> "instance"
+    """
+    def __init__(self, method):
+        self.method = method
+        self.__doc__ = method.__doc__
+
+    def __get__(self, obj, owner=None):
+        return MethodType(self.method, owner if obj is None else obj)
+
+
+def invalidate_classproperty(cls, name):
+    """Invalidate cached values of a `cached_classproperty`.
+
+    Every `cached_classproperty` named `name` in the MRO of `cls` drops the
+    values cached for `cls` and its subclasses, so overrides that build on
+    `super()` are recomputed too.
+
+    :param cls: type -- The class whose values should be recomputed.
+    :param name: str -- The property name.
+    """
+    for klass in cls.__mro__:
+        prop = klass.__dict__.get(name)
+        if isinstance(prop, cached_classproperty):
+            prop.invalidate(cls)
 
 
 # CLASS DECORATORS
 
 
+# `__new__` guards installed by `abstract_class`, mapped to the abstract
+#   class's own `__new__` (or None).
+_ABSTRACT_GUARDS = {}
+
+
+_new_object = object.__new__
+
+
+def _object_new(klass, *args, **kwargs):
+    # `object.__new__` rejects extra arguments once `__new__` is overridden.
+    return _new_object(klass)
+
+
+def _direct_new(klass, cls):
+    """The `__new__` that creates `klass` past abstract class `cls`, as it
+    would be without `abstract_class` guards.
+
+    :return: staticmethod
+    """
+    mro = klass.__mro__
+    for base in mro[mro.index(cls):]:
+        new = base.__dict__.get('__new__')
+        new = _ABSTRACT_GUARDS.get(new, new)
+        if new is object.__new__:
+            return staticmethod(_object_new)
+        if isinstance(new, staticmethod):
+            return new
+        if new is not None:
+            return staticmethod(new)
+
+
 def abstract_class(cls):
     """Mark class as abstract.
 
-    Instructs class's __init__ method to raise `core.exceptions.InitError`
-    if instantiated directly.
+    Installs a `__new__` guard on the class that raises
+    `core.exceptions.InitError` if the class itself is instantiated. The
+    first time a subclass is instantiated, the guard gives it a direct
+    `__new__` (the one it would inherit without the guard), so later
+    instantiations skip the check. The class and its metaclass are left as
+    they are, so abstract classes combine with any metaclass (e.g.
+    `abc.ABCMeta` mixins).
 
     Usage:
         @abstract_class
@@ -55,13 +181,16 @@ def abstract_class(cls):
         obj = MyChildClass() #-> <MyChildClass object>
         obj = MyAbstractClass() #-> InitError
     """
-    orig_init = cls.__init__
-
-    def init(self, *args, **kwargs):
-        if self.__class__ == cls:
+    def __new__(klass, *args, **kwargs):
+        if klass is cls:
             raise InitError('Cannot instantiate abstract class.')
-        else:
-            orig_init(self, *args, **kwargs)
-
-    cls.__init__ = init
+        new = _direct_new(klass, cls)
+        if klass.__new__ is __new__:
+            # No class between `klass` and the guard defines `__new__`.
+            klass.__new__ = new
+        return new.__get__(None, klass)(klass, *args, **kwargs)
+
+    guard = staticmethod(__new__)
+    _ABSTRACT_GUARDS[guard] = cls.__dict__.get('__new__')
+    cls.__new__ = guard
     return cls
@@ -7,48 +7,164 @@ dot notation.
 
 Exports:
     :class DotDict -- Standard mutable dot-notation dictionary.
+    :class RecursiveDotDict -- `DotDict` that lazily wraps nested dicts and
+        lists so they are dot-accessible too.
+    :class DotList -- List counterpart of `RecursiveDotDict`.
     :class ImmutableDotDict -- Dot-notation dictionary that restricts
         any sets (through dot or bracket notation) after initialization.
+    :class FrozenDotDict -- Deeply immutable, hashable `ImmutableDotDict`.
+    :class DotDictView -- Zero-copy, read-only dot-notation view of an
+        existing mapping.
 
 """
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+_MISSING = object()
+
 
 class DotDict(dict):
-    """Dictionary class where keys are accessible as attributes."""
+    """Dictionary class where keys are accessible as attributes.
+
+    Attribute reads only reach `__getattr__` after normal lookup fails, so
+    keys never shadow dict methods or instance attributes. Neither reads nor
+    writes rely on exceptions for control flow.
+    """
     def __getattr__(self, item):
-        try:
-            return self[item]
-        except:
-            raise AttributeError
+        value = dict.get(self, item, _MISSING)
+        if value is _MISSING:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, item))
+        return value
 
     def __setattr__(self, key, value):
-        if not hasattr(self, key):
-            self[key] = value
-        elif key in self:
+        if (key in self or not (key in self.__dict__ or
+                                hasattr(self.__class__, key))):
             self[key] = value
         else:
             self.__dict__[key] = value
 
     def __delattr__(self, item):
-        try:
+        if item in self:
             del self[item]
-        except:
-            raise AttributeError
+        elif item in self.__dict__:
+            del self.__dict__[item]
+        else:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, item))
+
+
+def _wrap(value):
+    """Wrap a plain dict or list for dot access; other values pass through.
+
+    Only exact `dict` / `list` instances are wrapped, so `DotDict`s (and any
+    other subclasses) are left as they are. The wrapper is a shallow copy of
+    `value`.
+    """
+    if type(value) is dict:
+        return RecursiveDotDict(value)
+    if type(value) is list:
+        return DotList(value)
+    return value
+
+
+class RecursiveDotDict(DotDict):
+    """`DotDict` whose nested dicts and lists are dot-accessible.
+
+    Nested values are wrapped lazily: a plain `dict` or `list` is wrapped the
+    first time it is read through attribute or item access, and the wrapper
+    replaces the raw value in place. Later reads are plain lookups, and
+    changes made through the wrapper are visible from the parent. Values
+    reached through `values()`, `items()` etc. are not wrapped.
+
+    Note:
+        Wrapping copies the nested dict or list (like `dict(value)`), so a
+        nested object passed in is shared with the caller only until it is
+        first read. From then on the wrapper is detached: changes through it
+        do not reach the caller's original object, nor the other way round.
+        Do not rely on aliasing nested objects; read back through the
+        `RecursiveDotDict` instead.
+
+    Usage:
+        config = RecursiveDotDict({'db': {'hosts': [{'name': 'a'}]}})
+        config.db.hosts[0].name #-> "a"
+    """
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is dict or type(value) is list:
+            value = _wrap(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getattr__(self, item):
+        value = dict.get(self, item, _MISSING)
+        if value is _MISSING:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, item))
+        if type(value) is dict or type(value) is list:
+            value = _wrap(value)
+            dict.__setitem__(self, item, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+
+class DotList(list):
+    """List whose nested dicts and lists are wrapped lazily on access.
+
+    See `RecursiveDotDict`, including its note on wrappers detaching from
+    the original nested objects. Slicing returns a plain list.
+    """
+    def __getitem__(self, index):
+        value = list.__getitem__(self, index)
+        if type(index) is not slice and (type(value) is dict or
+                                         type(value) is list):
+            value = _wrap(value)
+            list.__setitem__(self, index, value)
+        return value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
 
 
 class ImmutableDotDict(DotDict):
-    """Read-only dot-notation dictionary."""
+    """Read-only dot-notation dictionary.
+
+    Class Methods:
+        from_items -- Fast bulk constructor.
+    """
+    @classmethod
+    def from_items(cls, items):
+        """Build an instance directly from a mapping or key/value iterable.
+
+        Skips `__init__` (including any subclass `__init__`) and populates
+        the underlying dict in a single bulk update.
+
+        :param items: mapping | iterable -- Mapping or (key, value) pairs.
+        :return: ImmutableDotDict
+        """
+        obj = dict.__new__(cls)
+        dict.update(obj, items)
+        obj.__dict__['_ImmutableDotDict__locked'] = True
+        return obj
+
     def __init__(self, *args):
-        self.__locked = True
+        self.__dict__['_ImmutableDotDict__locked'] = True
         super(ImmutableDotDict, self).__init__(*args)
 
     def __setattr__(self, key, value):
-        try:
-            if self.__locked:
-                raise ValueError("Cannot assign to immutable object once "
-                                 "initialized.")
-        except AttributeError:
-            self.__dict__[key] = value
+        if self.__dict__.get('_ImmutableDotDict__locked'):
+            raise ValueError("Cannot assign to immutable object once "
+                             "initialized.")
+        self.__dict__[key] = value
 
     def __setitem__(self, key, value):
         raise ValueError("Cannot assign to immutable object.")
@@ -60,6 +176,110 @@ class ImmutableDotDict(DotDict):
             raise AttributeError("Cannot delete from immutable object.")
 
 
+def _freeze(value):
+    """Deeply convert a value into hashable, immutable equivalents."""
+    if isinstance(value, FrozenDotDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDotDict(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(x) for x in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(x) for x in value)
+    return value
+
+
+class FrozenDotDict(ImmutableDotDict):
+    """Deeply immutable, hashable dot-notation dictionary.
+
+    Nested dicts become `FrozenDotDict`s, lists and tuples become tuples and
+    sets become frozensets, all once at construction. Every mutating dict
+    method is disabled, so instances can key memoization caches and be
+    shared between threads without copying. The structural hash is computed
+    on first use and cached.
+
+    Usage:
+        key = FrozenDotDict({'user': 1, 'roles': ['a', 'b']})
+        cache[key] = result
+        key.roles #-> "('a', 'b')"
+    """
+    def __init__(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        super(FrozenDotDict, self).__init__(
+            dict((k, _freeze(v)) for k, v in items.iteritems()))
+
+    def __hash__(self):
+        value = self.__dict__.get('_FrozenDotDict__hash')
+        if value is None:
+            value = hash(frozenset(self.iteritems()))
+            self.__dict__['_FrozenDotDict__hash'] = value
+        return value
+
+    def _immutable(self, *args, **kwargs):
+        raise ValueError("Cannot assign to immutable object.")
+
+    __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class DotDictView(Mapping):
+    """Zero-copy, read-only dot-notation view of an existing mapping.
+
+    Wraps the mapping without copying it (like `types.MappingProxyType`), so
+    large lookup tables can be built once and shared read-only. Changes made
+    to the underlying mapping are visible through the view.
+
+    Usage:
+        table = {'alpha': 1}
+        view = DotDictView(table)
+        view.alpha #-> "1"
+        view.alpha = 2 #-> ValueError
+    """
+    __slots__ = ('__mapping',)
+
+    def __init__(self, mapping):
+        object.__setattr__(self, '_DotDictView__mapping', mapping)
+
+    def __getattr__(self, item):
+        value = self.__mapping.get(item, _MISSING)
+        if value is _MISSING:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, item))
+        return value
+
+    def __getitem__(self, key):
+        return self.__mapping[key]
+
+    def __contains__(self, key):
+        return key in self.__mapping
+
+    def __iter__(self):
+        return iter(self.__mapping)
+
+    def __len__(self):
+        return len(self.__mapping)
+
+    def get(self, key, default=None):
+        return self.__mapping.get(key, default)
+
+    def __setattr__(self, key, value):
+        raise ValueError("Cannot assign to read-only view.")
+
+    def __delattr__(self, item):
+        raise ValueError("Cannot delete from read-only view.")
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.__mapping)
+
+
 # ----------------------------------------------------------------------------
 __license__ = "TBD"
 __copyright__ = "Copyright (c) 2015 David Zimmelman - All Rights Reserved."
@@ -5,29 +5,194 @@
 Exports:
     :class Enum -- Basic enumerated value object.
     :class EnumInt -- Enum with int values instead of str.
+    :class EnumFlag -- EnumInt with power-of-two values, combinable into an
+        int bitmask.
 
 """
 
+from numbers import Integral
+
 from core.dotdict import ImmutableDotDict
 
+try:
+    _intern = intern
+except NameError:
+    from sys import intern as _intern
+
+
+def _interned(values):
+    """Intern str names/values so decoded members share one object.
+
+    :param values: iterable
+    :return: list
+    """
+    return [_intern(v) if type(v) is str else v for v in values]
+
+
+def _from_items(cls, items):
+    """Unpickle an Enum from its (name, value) pairs in declaration order."""
+    return cls.from_items(items)
+
 
 class Enum(ImmutableDotDict):
     """ Simple class for generating enumerated sets of constants.
 
+    Every lookup below is a single dict lookup (unhashable values are found
+    by a scan instead). Names map to values through the Enum itself. A
+    value -> name index is built at init only if some value differs from
+    its name; otherwise the Enum serves as its own index. Ordinals come from
+    the ordered names, indexed on first use. Members sharing a value are
+    aliases; the value maps back to the first declared name. Str names and
+    values are interned.
+
+    Public Methods:
+        name_of -- Get the name of the member holding the given value.
+        value_of -- Get the value of the named member.
+        ordinal -- Get the position of the named member.
+        contains_value -- Test whether a value belongs to the Enum.
+        encode -- Bulk convert names to values.
+        decode -- Bulk convert values to names.
+
     Init Parameters:
         *args: One or more strings. These will be the literal
             enum values, as well as the property names.
+            Alternatively, a single dict of names mapped to values.
 
     Usage:
         Values = Enum('One', 'Two', 'Horse')
         repr(Values.One) #-> "'One'"
         repr(Values['Two']) #-> "'Two'"
         repr(Values) #-> "['Horse', 'One', 'Two']"
+        Values.decode(['One', 'Horse']) #-> "['One', 'Horse']"
     """
 
+    # Indexes only set on instances that need them; see `_build_index`.
+    _unhashable = ()
+    _ordinals = None
+
+    @classmethod
+    def from_items(cls, items):
+        """Build an Enum directly from a mapping or (name, value) pairs.
+
+        :param items: mapping | iterable -- Names mapped to values.
+        :return: Enum
+        """
+        if isinstance(items, dict):
+            items = items.iteritems()
+        pairs = list(items)
+        names = _interned(k for k, _ in pairs)
+        values = _interned(v for _, v in pairs)
+        obj = super(Enum, cls).from_items(zip(names, values))
+        obj._build_index(names, values)
+        return obj
+
+    def _build_index(self, names, values):
+        """Build the lookup indexes from ordered names and their values.
+
+        :param names: list -- Member names in declaration order.
+        :param values: list -- Their values.
+        """
+        self.__dict__['_names'] = tuple(names)
+        if values is names or values == names:
+            self.__dict__['_by_value'] = self
+            return
+        unhashable = []
+        try:
+            by_value = dict(zip(values, names))
+        except TypeError:
+            by_value = None
+        if by_value is None or len(by_value) != len(names):
+            # Unhashable or shared values; the first declared name wins.
+            by_value = {}
+            for name, value in zip(names, values):
+                try:
+                    by_value.setdefault(value, name)
+                except TypeError:
+                    if not [v for v, _ in unhashable if v == value]:
+                        unhashable.append((value, name))
+        self.__dict__['_by_value'] = by_value
+        if unhashable:
+            self.__dict__['_unhashable'] = tuple(unhashable)
+
+    def _scan(self, value):
+        """Name of the unhashable member value equal to `value`, or None."""
+        for member, name in self._unhashable:
+            if member == value:
+                return name
+        return None
+
     def name_of(self, value):
-        """Only here for Enum consistency."""
-        return self[value]
+        """Get name for Enum value.
+
+        :param value: mixed
+        :return: str -- Member name.
+        :raises KeyError if no member has the given value.
+        """
+        try:
+            return self._by_value[value]
+        except (KeyError, TypeError):
+            name = self._scan(value)
+            if name is None:
+                raise KeyError(value)
+            return name
+
+    def value_of(self, name):
+        """Get value for Enum member name.
+
+        :param name: str
+        :return: mixed -- Member value.
+        :raises KeyError if no member has the given name.
+        """
+        return self[name]
+
+    def ordinal(self, name):
+        """Get zero-based position of member.
+
+        :param name: str
+        :return: int
+        :raises KeyError if no member has the given name.
+        """
+        ordinals = self._ordinals
+        if ordinals is None:
+            ordinals = dict(zip(self._names, xrange(len(self._names))))
+            self.__dict__['_ordinals'] = ordinals
+        return ordinals[name]
+
+    def contains_value(self, value):
+        """Test whether any member holds the given value.
+
+        :param value: mixed
+        :return: bool
+        """
+        try:
+            if value in self._by_value:
+                return True
+        except TypeError:
+            pass
+        return self._scan(value) is not None
+
+    def encode(self, names):
+        """Convert a sequence of member names to their values.
+
+        :param names: iterable -- Member names.
+        :return: list -- Values.
+        :raises KeyError for an unknown name.
+        """
+        lookup = self.__getitem__
+        return [lookup(name) for name in names]
+
+    def decode(self, values):
+        """Convert a sequence of values to their (interned) member names.
+
+        :param values: iterable -- Member values.
+        :return: list -- Names.
+        :raises KeyError for an unknown value.
+        """
+        if self._unhashable:
+            lookup = self.name_of
+        else:
+            lookup = self._by_value.__getitem__
+        return [lookup(value) for value in values]
 
     def __init__(self, *args):
         """Enum init.
@@ -35,12 +200,12 @@ class Enum(ImmutableDotDict):
         :param args: str,... -- Enum literal values / prop names.
         """
         if len(args) == 1 and type(args[0]) is dict:
-            d = args[0]
+            names = _interned(args[0].iterkeys())
+            values = _interned(args[0].itervalues())
         else:
-            d = {}
-            for arg in args:
-                d[arg] = arg
-        super(Enum, self).__init__(d)
+            names = values = _interned(args)
+        super(Enum, self).__init__(zip(names, values))
+        self._build_index(names, values)
 
     def __str__(self):
         return repr(self)
@@ -48,10 +213,18 @@ class Enum(ImmutableDotDict):
     def __repr__(self):
         return str(tuple(self))
 
+    def __reduce__(self):
+        return _from_items, (self.__class__,
+                             [(name, self[name]) for name in self._names])
+
 
 class EnumInt(Enum):
     """ C-style enum with int values, rather than str.
 
+    Values are the ordinals plus one, so single value -> name lookups
+    index the ordered names directly. The value -> name dict used by bulk
+    `decode` is only built on its first call.
+
     Public Methods:
         name_of -- Get the string name of the key that holds the given value.
 
@@ -65,27 +238,210 @@ class EnumInt(Enum):
         repr(Values.One) #-> "1"
         repr(Values['Horse']) #-> "3"
         repr(Values) #-> "['One', 'Two', 'Horse']"
+        Values.encode(['Horse', 'One']) #-> "[3, 1]"
     """
 
+    _by_value = None
+
+    def _build_index(self, names, values):
+        self.__dict__['_names'] = tuple(names)
+
     def name_of(self, value):
-        """Get key name for Enum value.
+        """Get name for Enum value.
 
         :param value: int
-        :return: str -- Key name.
+        :return: str -- Member name.
+        :raises KeyError if no member has the given value.
         """
-        return self._ordered_args[value - 1]
+        try:
+            if value > 0:
+                return self._names[value - 1]
+        except (IndexError, TypeError):
+            pass
+        raise KeyError(value)
+
+    def ordinal(self, name):
+        return self[name] - 1
+
+    def contains_value(self, value):
+        try:
+            self.name_of(value)
+        except KeyError:
+            return False
+        return True
+
+    def decode(self, values):
+        by_value = self._by_value
+        if by_value is None:
+            by_value = dict(zip(self, self._names))
+            self.__dict__['_by_value'] = by_value
+        lookup = by_value.__getitem__
+        return [lookup(value) for value in values]
 
     def __init__(self, *args):
         """Enum init.
 
         :param args: str,... -- Enum literal values / prop names.
         """
-        d = dict(zip(args, range(1, len(args) + 1)))
-        self._ordered_args = args
-        super(Enum, self).__init__(d)
+        names = _interned(args)
+        values = range(1, len(names) + 1)
+        super(Enum, self).__init__(zip(names, values))
+        self._build_index(names, values)
 
     def __repr__(self):
-        return str(self._ordered_args)
+        return str(self._names)
 
     def __iter__(self):
-        return (x for x in xrange(1, len(self._ordered_args) + 1))
+        return (x for x in xrange(1, len(self._names) + 1))
+
+    def __reduce__(self):
+        return self.__class__, self._names
+
+
+class EnumFlag(EnumInt):
+    """ Bit-flag enum; member values are powers of two.
+
+    A set of members is represented as a single int bitmask, so union,
+    intersection and membership are plain integer operations.
+
+    Public Methods:
+        mask -- Combine member names (or values) into a bitmask.
+        names_of -- Get the names of all members set in a bitmask.
+        has -- Test whether a member is set in a bitmask.
+        union -- Bitmask of members set in any of the given masks.
+        intersection -- Bitmask of members set in all of the given masks.
+        difference -- Bitmask of members set in one mask but not another.
+        complement -- Bitmask of members not set in a mask.
+        rule -- `DataModel` rule persisting a set of flags as one integer.
+
+    Init Parameters:
+        args -- One or more strings. These will be the property names.
+            Values are assigned as 1, 2, 4, ... in order of arguments.
+
+    Usage:
+        Perms = EnumFlag('Read', 'Write', 'Admin')
+        repr(Perms.Admin) #-> "4"
+        rw = Perms.mask(['Read', 'Write']) #-> "3"
+        Perms.has(rw, 'Write') #-> "True"
+        Perms.names_of(rw | Perms.Admin) #-> "['Read', 'Write', 'Admin']"
+
+        class User(DataModelController):
+            # `self.perms` holds a list of names; the model stores an int.
+            MODEL_RULES = {'perms': Perms.rule('perms'), ...}
+    """
+
+    def __init__(self, *args):
+        """EnumFlag init.
+
+        :param args: str,... -- Flag names.
+        """
+        names = _interned(args)
+        values = [1 << i for i in range(len(names))]
+        super(Enum, self).__init__(zip(names, values))
+        self._build_index(names, values)
+        self.__dict__['_all'] = (1 << len(names)) - 1
+
+    def __iter__(self):
+        return (1 << i for i in xrange(len(self._names)))
+
+    def name_of(self, value):
+        """Get name for a single flag value.
+
+        :param value: int -- A power of two.
+        :return: str -- Member name.
+        :raises KeyError if no member has the given value.
+        """
+        try:
+            if value > 0 and not value & (value - 1):
+                return self._names[value.bit_length() - 1]
+        except (AttributeError, IndexError, TypeError):
+            pass
+        raise KeyError(value)
+
+    def ordinal(self, name):
+        return self[name].bit_length() - 1
+
+    def mask(self, members):
+        """Combine members into a bitmask.
+
+        :param members: iterable -- Member names and/or values.
+        :return: int
+        :raises KeyError for an unknown member.
+        """
+        result = 0
+        for member in members:
+            result |= self._value(member)
+        return result
+
+    def _value(self, member):
+        """Value of a member given by name or value.
+
+        :raises KeyError for an unknown member.
+        """
+        value = dict.get(self, member)
+        if value is None:
+            self.name_of(member)
+            value = member
+        return value
+
+    def names_of(self, mask):
+        """Get names of the members set in a bitmask.
+
+        Runs in O(set bits).
+
+        :param mask: int
+        :return: list -- Member names in declaration order.
+        :raises ValueError if the mask has bits outside this Enum.
+        """
+        if mask & ~self._all:
+            raise ValueError('Mask has bits outside of %r: %d' % (self, mask))
+        members = self._names
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(members[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def has(self, mask, member):
+        """Test whether a member is set in a bitmask.
+
+        :param mask: int
+        :param member: str | int -- Member name or value.
+        :return: bool
+        :raises KeyError for an unknown member.
+        """
+        value = self._value(member)
+        return mask & value == value
+
+    @staticmethod
+    def union(*masks):
+        result = 0
+        for mask in masks:
+            result |= mask
+        return result
+
+    @staticmethod
+    def intersection(mask, *masks):
+        for other in masks:
+            mask &= other
+        return mask
+
+    @staticmethod
+    def difference(mask, other):
+        return mask & ~other
+
+    def complement(self, mask):
+        return self._all & ~mask
+
+    def rule(self, binding):
+        """Build a `DataModel` rule storing a set of flags as one integer.
+
+        The bound controller attribute holds an iterable of member names (or
+        values); the model key holds their combined bitmask. Use `names_of`
+        to decode a stored model value.
+
+        :param binding: str -- Name of the bound controller attribute.
+        :return: tuple -- (binding, type, operation) rule definition.
+        """
+        return binding, Integral, self.mask
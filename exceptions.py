@@ -5,6 +5,7 @@
 Exports:
     :class InitError
     :class StateError
+    :class ConflictError
 
 """
 
@@ -17,3 +18,24 @@ class InitError(StandardError):
 class StateError(RuntimeError):
     """Errors pertaining to an object's state at runtime."""
     pass
+
+
+class ConflictError(StateError):
+    """Compare-and-set save rejected; the stored version has moved on.
+
+    Properties:
+        :type uid: str -- The uid of the conflicting model.
+        :type expected: int -- The stored version the save was based on.
+        :type actual: int | None -- The version currently stored, if known.
+        :type delta: dict -- Keys changed locally since `expected`, mapped to
+            their current values; apply these to the stored data to merge.
+        :type stored: dict | None -- The data currently stored, if known.
+    """
+
+    def __init__(self, uid, expected, actual=None, delta=None, stored=None):
+        super(ConflictError, self).__init__(
+            'Version conflict saving `%s`: expected version %s, stored '
+            'version is %s.' % (uid, expected, actual))
+        self.uid, self.expected, self.actual = uid, expected, actual
+        self.delta = delta or {}
+        self.stored = stored
@@ -0,0 +1,308 @@
+"""Secondary indexes over in-memory controllers.
+
+Indexes are declared on `DataModel` keys per controller class and are kept
+up to date incrementally through the controllers' change listeners, so
+lookups by key value do not need to scan every controller's `model`.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :class HashIndex -- Equality index.
+    :class SortedIndex -- Equality, range and prefix index.
+    :class IndexManager -- Declares indexes per controller class and keeps
+        them up to date for tracked controllers.
+
+Usage:
+    indexes = IndexManager()
+    indexes.declare(PhoneRecord, 'lastname')
+    indexes.declare(PhoneRecord, 'number', 'sorted')
+    for record in records:
+        indexes.track(record)
+    indexes.find(PhoneRecord, 'lastname', 'Belcher') #-> [<PhoneRecord>, ...]
+    indexes.prefix(PhoneRecord, 'number', '555-')
+    indexes.range(PhoneRecord, 'number', '555-1000', '555-2000')
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+class HashIndex(object):
+    """Equality index; values must be hashable.
+
+    Public Methods:
+        add -- Index a controller under a value.
+        remove -- Remove a controller from the index.
+        update -- Re-index a controller under a new value.
+        find -- Controllers indexed under a value.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, ctrl, value):
+        self._values[ctrl] = value
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            bucket = self._buckets[value] = {}
+        bucket[ctrl] = True
+
+    def remove(self, ctrl):
+        if ctrl not in self._values:
+            return
+        value = self._values.pop(ctrl)
+        bucket = self._buckets[value]
+        del bucket[ctrl]
+        if not bucket:
+            del self._buckets[value]
+
+    def update(self, ctrl, value):
+        if ctrl in self._values:
+            if self._values[ctrl] == value:
+                return
+            self.remove(ctrl)
+        self.add(ctrl, value)
+
+    def find(self, value):
+        """Controllers indexed under `value`.
+
+        :param value: mixed
+        :return: list
+        """
+        return list(self._buckets.get(value, ()))
+
+
+class SortedIndex(object):
+    """Sorted index supporting equality, range and prefix queries.
+
+    Values must be mutually orderable. Queries are O(log n + k); updates are
+    O(n) list insertions/deletions (memmove), which stays cheap for in-memory
+    controller counts.
+
+    Public Methods:
+        add -- Index a controller under a value.
+        remove -- Remove a controller from the index.
+        update -- Re-index a controller under a new value.
+        find -- Controllers indexed under a value.
+        range -- Controllers with values within bounds.
+        prefix -- Controllers with string values starting with a prefix.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._ctrls = []
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, ctrl, value):
+        self._values[ctrl] = value
+        i = bisect_right(self._keys, value)
+        self._keys.insert(i, value)
+        self._ctrls.insert(i, ctrl)
+
+    def remove(self, ctrl):
+        if ctrl not in self._values:
+            return
+        value = self._values.pop(ctrl)
+        lo = bisect_left(self._keys, value)
+        hi = bisect_right(self._keys, value, lo)
+        for i in range(lo, hi):
+            if self._ctrls[i] is ctrl:
+                del self._keys[i]
+                del self._ctrls[i]
+                return
+
+    def update(self, ctrl, value):
+        if ctrl in self._values:
+            if self._values[ctrl] == value:
+                return
+            self.remove(ctrl)
+        self.add(ctrl, value)
+
+    def find(self, value):
+        """Controllers indexed under `value`.
+
+        :param value: mixed
+        :return: list
+        """
+        lo = bisect_left(self._keys, value)
+        return self._ctrls[lo:bisect_right(self._keys, value, lo)]
+
+    def range(self, low=None, high=None, inclusive=(True, True)):
+        """Controllers with values between `low` and `high`, in value order.
+
+        :param low: mixed | None -- Lower bound. If None, unbounded.
+        :param high: mixed | None -- Upper bound. If None, unbounded.
+        :param inclusive: tuple (bool, bool) -- Whether each bound is
+            inclusive.
+        :return: list
+        """
+        keys = self._keys
+        if low is None:
+            lo = 0
+        elif inclusive[0]:
+            lo = bisect_left(keys, low)
+        else:
+            lo = bisect_right(keys, low)
+        if high is None:
+            hi = len(keys)
+        elif inclusive[1]:
+            hi = bisect_right(keys, high, lo)
+        else:
+            hi = bisect_left(keys, high, lo)
+        return self._ctrls[lo:hi]
+
+    def prefix(self, prefix):
+        """Controllers with string values starting with `prefix`.
+
+        :param prefix: str
+        :return: list -- In value order.
+        """
+        keys = self._keys
+        lo = bisect_left(keys, prefix)
+        if not prefix:
+            return self._ctrls[lo:]
+        last = ord(prefix[-1])
+        try:
+            end = prefix[:-1] + type(prefix)(chr(last + 1)
+                                             if isinstance(prefix, str)
+                                             else unichr(last + 1))
+        except ValueError:
+            # Last character is the maximum code point; scan instead.
+            hi = lo
+            while hi < len(keys) and keys[hi].startswith(prefix):
+                hi += 1
+            return self._ctrls[lo:hi]
+        return self._ctrls[lo:bisect_left(keys, end, lo)]
+
+
+class IndexManager(object):
+    """Declares secondary indexes per controller class.
+
+    Tracked controllers are indexed on every declared key of their class.
+    The index is kept current by internal change listeners (see
+    `DataModelController._add_hook`), fired from the same `update_key` /
+    `_call_listener` path as any other listener. Removing a controller's
+    listeners with `off_change` does not remove them; use `untrack`.
+
+    Public Methods:
+        declare -- Declare an index on a `DataModel` key.
+        track -- Index a controller and follow its changes.
+        untrack -- Remove a controller from all indexes.
+        index -- Get the declared index for a key.
+        find -- Equality query.
+        range -- Range query (sorted indexes).
+        prefix -- Prefix query (sorted indexes).
+    """
+
+    KINDS = {'hash': HashIndex, 'sorted': SortedIndex}
+
+    def __init__(self):
+        self._indexes = {}
+        self._tracked = {}
+
+    def declare(self, ctrl_cls, key, kind='hash'):
+        """Declare an index on a `DataModel` key of a controller class.
+
+        Controllers of the class that are already tracked are indexed
+        immediately.
+
+        :param ctrl_cls: type -- Controller class.
+        :param key: str -- `DataModel` key.
+        :param kind: str -- 'hash' (equality only) or 'sorted'.
+        :return: HashIndex | SortedIndex
+        :raises ValueError if `kind` is unknown or an index of a different
+            kind already exists for the key.
+        """
+        if kind not in self.KINDS:
+            raise ValueError('Unknown index kind: ' + kind)
+        indexes = self._indexes.setdefault(ctrl_cls, {})
+        if key in indexes:
+            if not isinstance(indexes[key], self.KINDS[kind]):
+                raise ValueError('Index on `' + key + '` already declared '
+                                 'with a different kind.')
+            return indexes[key]
+        index = indexes[key] = self.KINDS[kind]()
+        for ctrl in self._tracked.get(ctrl_cls, ()):
+            self._watch(ctrl, key, index)
+        return index
+
+    def _watch(self, ctrl, key, index):
+        index.add(ctrl, ctrl.model[key])
+        ctrl._add_hook(key, self._on_change, [index, ctrl])
+
+    def _on_change(self, model, key, instruction, index, ctrl):
+        index.update(ctrl, model[key])
+
+    def track(self, ctrl):
+        """Index a controller on its class's declared keys.
+
+        :param ctrl: DataModelController
+        """
+        tracked = self._tracked.setdefault(ctrl.__class__, {})
+        if ctrl in tracked:
+            return
+        tracked[ctrl] = True
+        for key, index in self._indexes.get(ctrl.__class__, {}).items():
+            self._watch(ctrl, key, index)
+
+    def untrack(self, ctrl):
+        """Remove a controller from all indexes and stop following it.
+
+        :param ctrl: DataModelController
+        """
+        tracked = self._tracked.get(ctrl.__class__, {})
+        if tracked.pop(ctrl, None) is None:
+            return
+        for key, index in self._indexes.get(ctrl.__class__, {}).items():
+            index.remove(ctrl)
+            ctrl.off_change(key, self._on_change)
+
+    def index(self, ctrl_cls, key):
+        """Get the declared index.
+
+        :raises KeyError if no index is declared for the key.
+        """
+        try:
+            return self._indexes[ctrl_cls][key]
+        except KeyError:
+            raise KeyError('No index declared on ' + ctrl_cls.__name__ +
+                           '.' + key)
+
+    def _sorted(self, ctrl_cls, key):
+        index = self.index(ctrl_cls, key)
+        if not isinstance(index, SortedIndex):
+            raise TypeError('Range and prefix queries require a sorted '
+                            'index: ' + ctrl_cls.__name__ + '.' + key)
+        return index
+
+    def find(self, ctrl_cls, key, value):
+        """Tracked controllers whose `key` equals `value`.
+
+        :return: list
+        """
+        return self.index(ctrl_cls, key).find(value)
+
+    def range(self, ctrl_cls, key, low=None, high=None,
+              inclusive=(True, True)):
+        """Tracked controllers whose `key` is within bounds.
+
+        See `SortedIndex.range`.
+
+        :return: list
+        :raises TypeError if the index is not sorted.
+        """
+        return self._sorted(ctrl_cls, key).range(low, high, inclusive)
+
+    def prefix(self, ctrl_cls, key, prefix):
+        """Tracked controllers whose string `key` starts with `prefix`.
+
+        :return: list
+        :raises TypeError if the index is not sorted.
+        """
+        return self._sorted(ctrl_cls, key).prefix(prefix)
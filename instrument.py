@@ -0,0 +1,351 @@
+"""Hot-path instrumentation.
+
+Low-overhead counters and latency histograms for the `DataModel` and
+`DataModelController` internals (rule evaluation, validation, listener
+dispatch and data-store I/O). Recording is off by default; while off, every
+instrumented call site costs a single module attribute check.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :data ACTIVE -- True while at least one sink is installed. Checked by
+        instrumented call sites before doing any work.
+    :callable clock -- High resolution timer used for all samples.
+    :class Histogram -- Fixed-bucket latency histogram.
+    :class Recorder -- In-process sink that aggregates samples for
+        `snapshot`.
+    :class CallbackSink -- Sink that forwards every sample to a callable.
+    :class StatsdSink -- Sink that emits statsd-format UDP datagrams.
+    :callable enable -- Install sink(s) and turn recording on.
+    :callable disable -- Remove sink(s); recording stops with the last one.
+    :callable record -- Record a timed sample.
+    :callable incr -- Increment a counter.
+    :callable gauge -- Set a gauge (e.g. a queue depth).
+    :callable snapshot -- Merged snapshot of all installed `Recorder`s.
+
+Usage:
+    from core import instrument
+    recorder = instrument.enable()
+    ...  # exercise controllers
+    instrument.snapshot()['rule.PhoneRecord.firstname']['mean']
+    instrument.disable()
+"""
+
+from bisect import bisect_left
+from threading import Lock
+import time
+
+
+clock = getattr(time, 'perf_counter', time.time)
+
+ACTIVE = False
+
+_sinks = ()
+
+
+class Histogram(object):
+    """Fixed-bucket latency histogram.
+
+    Bucket bounds are upper bounds in seconds; the final bucket is unbounded.
+
+    Properties:
+        :type count: int -- Number of samples.
+        :type total: float -- Sum of all samples.
+        :type min: float | None -- Smallest sample.
+        :type max: float | None -- Largest sample.
+    """
+
+    BOUNDS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+              1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+
+    def add(self, value):
+        """Add a sample.
+
+        :param value: float -- Elapsed seconds.
+        """
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.buckets[bisect_left(self.BOUNDS, value)] += 1
+
+    def merge(self, other):
+        """Add another histogram's samples to this one.
+
+        :param other: Histogram
+        """
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or
+                                      other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or
+                                      other.max > self.max):
+            self.max = other.max
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def quantile(self, q):
+        """Approximate quantile from bucket bounds.
+
+        :param q: float -- Quantile in [0, 1].
+        :return: float | None -- Upper bound of the bucket containing the
+            quantile, or the max sample for the unbounded bucket.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                if i < len(self.BOUNDS):
+                    return min(self.BOUNDS[i], self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip(self.BOUNDS + (None,), self.buckets))
+        }
+
+
+class Recorder(object):
+    """In-process sink; aggregates samples per class and per rule.
+
+    Every sample is aggregated twice: once under `category.Owner` and once
+    under `category.Owner.name`, so class-level totals are available without
+    summing rules.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def record(self, category, owner, name, elapsed):
+        class_key = category + '.' + owner
+        keys = (class_key, class_key + '.' + name) if name else (class_key,)
+        with self._lock:
+            for key in keys:
+                hist = self._histograms.get(key)
+                if hist is None:
+                    hist = self._histograms[key] = Histogram()
+                hist.add(elapsed)
+
+    def incr(self, category, owner, name, value):
+        class_key = category + '.' + owner
+        keys = (class_key, class_key + '.' + name) if name else (class_key,)
+        with self._lock:
+            for key in keys:
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def gauge(self, category, owner, name, value):
+        key = category + '.' + owner + ('.' + name if name else '')
+        with self._lock:
+            self._gauges[key] = value
+
+    def merge_into(self, other):
+        """Add this recorder's histograms and counters to another's.
+
+        Gauges are current values, not totals; `other` takes this
+        recorder's gauge values.
+
+        :param other: Recorder
+        """
+        with self._lock:
+            for key, hist in self._histograms.iteritems():
+                target = other._histograms.get(key)
+                if target is None:
+                    target = other._histograms[key] = Histogram()
+                target.merge(hist)
+            for key, value in self._counters.iteritems():
+                other._counters[key] = other._counters.get(key, 0) + value
+            other._gauges.update(self._gauges)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def snapshot(self):
+        """Return aggregated metrics.
+
+        :return: dict -- Metric name mapped to a histogram dict (see
+            `Histogram.to_dict`) or, for counters and gauges, a number.
+        """
+        with self._lock:
+            snap = dict((k, v.to_dict())
+                        for k, v in self._histograms.iteritems())
+            snap.update(self._counters)
+            snap.update(self._gauges)
+        return snap
+
+
+class CallbackSink(object):
+    """Sink forwarding every sample to a callable.
+
+    Init Params:
+        func -- callable (kind, category, owner, name, value) where `kind` is
+            'timing' (value in seconds), 'count' or 'gauge'.
+    """
+
+    def __init__(self, func):
+        self._func = func
+
+    def record(self, category, owner, name, elapsed):
+        self._func('timing', category, owner, name, elapsed)
+
+    def incr(self, category, owner, name, value):
+        self._func('count', category, owner, name, value)
+
+    def gauge(self, category, owner, name, value):
+        self._func('gauge', category, owner, name, value)
+
+
+class StatsdSink(object):
+    """Sink emitting statsd-format UDP datagrams.
+
+    Timings are sent in milliseconds (`|ms`), counters as `|c`, gauges as
+    `|g`. Send errors are swallowed; metrics must never break the
+    instrumented code.
+
+    Init Params:
+        host -- statsd host.
+        port -- statsd UDP port.
+        prefix -- Optional metric name prefix.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix=''):
+        # Imported here so that `core.instrument` (imported by `datamodel`)
+        #   does not pay for `socket` unless statsd is used.
+        import socket
+        self._error = socket.error
+        self._address = (host, port)
+        self._prefix = prefix + '.' if prefix else ''
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def _name(self, category, owner, name):
+        if name:
+            return self._prefix + category + '.' + owner + '.' + name
+        return self._prefix + category + '.' + owner
+
+    def _send(self, payload):
+        try:
+            self._socket.sendto(payload.encode('utf-8'), self._address)
+        except self._error:
+            pass
+
+    def record(self, category, owner, name, elapsed):
+        self._send('%s:%.6f|ms' % (self._name(category, owner, name),
+                                   elapsed * 1000.0))
+
+    def incr(self, category, owner, name, value):
+        self._send('%s:%d|c' % (self._name(category, owner, name), value))
+
+    def gauge(self, category, owner, name, value):
+        self._send('%s:%s|g' % (self._name(category, owner, name), value))
+
+    def close(self):
+        self._socket.close()
+
+
+def enable(*sinks):
+    """Install sink(s) and turn recording on.
+
+    :param sinks: object,... -- Objects implementing `record` and `incr`
+        (and optionally `gauge`). If none are given a new `Recorder` is
+        installed.
+    :return: object -- The first installed sink.
+    """
+    global ACTIVE, _sinks
+    if not sinks:
+        sinks = (Recorder(),)
+    _sinks = _sinks + tuple(sinks)
+    ACTIVE = True
+    return sinks[0]
+
+
+def disable(sink=None):
+    """Remove sink(s). Recording stops once no sinks remain.
+
+    :param sink: object | None -- Sink to remove. If None, all are removed.
+    """
+    global ACTIVE, _sinks
+    if sink is None:
+        _sinks = ()
+    else:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+    ACTIVE = bool(_sinks)
+
+
+def record(category, owner, name, start):
+    """Record a timed sample that began at `start`.
+
+    :param category: str -- Metric category ('rule', 'validate', 'listener',
+        'store' or 'persist').
+    :param owner: str -- Controller class name.
+    :param name: str | None -- Rule key or operation name.
+    :param start: float -- `clock()` value taken when the operation began.
+    """
+    elapsed = clock() - start
+    for sink in _sinks:
+        sink.record(category, owner, name, elapsed)
+
+
+def incr(category, owner, name, value=1):
+    """Increment a counter.
+
+    :param category: str -- Metric category.
+    :param owner: str -- Controller class name.
+    :param name: str | None -- Rule key or operation name.
+    :param value: int -- Increment.
+    """
+    for sink in _sinks:
+        sink.incr(category, owner, name, value)
+
+
+def gauge(category, owner, name, value):
+    """Set a gauge. Sinks without a `gauge` method ignore it.
+
+    :param category: str -- Metric category.
+    :param owner: str -- Owner (e.g. class) name.
+    :param name: str | None -- Metric name.
+    :param value: int | float -- Current value.
+    """
+    for sink in _sinks:
+        if hasattr(sink, 'gauge'):
+            sink.gauge(category, owner, name, value)
+
+
+def snapshot():
+    """Merged snapshot of all installed `Recorder` sinks.
+
+    Histograms and counters of the same metric are added up; gauges take the
+    value of the most recently installed recorder.
+
+    :return: dict -- See `Recorder.snapshot`.
+    """
+    merged = Recorder()
+    for sink in _sinks:
+        if isinstance(sink, Recorder):
+            sink.merge_into(merged)
+    return merged.snapshot()
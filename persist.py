@@ -0,0 +1,223 @@
+"""Write-behind persistence.
+
+Moves `DataModelController.save` off the request path: controllers attached
+to a `WriteBehindQueue` are marked dirty by their own model updates and
+saved in bulk by a background thread. Repeated changes to the same
+controller between flushes are coalesced into a single save.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :class WriteBehindQueue -- Background, coalescing persister.
+
+Usage:
+    queue = WriteBehindQueue(store, interval=0.5, max_pending=500)
+    record = queue.attach(PhoneRecord.new(store, name='Gene Belcher'))
+    record.name = 'Gene The Magic Man Belcher' # saved on the next flush
+    ...
+    queue.close() # also runs at interpreter exit
+"""
+
+import atexit
+from collections import OrderedDict
+from threading import Event, Lock, Thread
+
+from core import instrument
+from core.exceptions import ConflictError
+
+
+class WriteBehindQueue(object):
+    """Background persister coalescing saves per controller.
+
+    A flush saves every pending controller once, through
+    `DataModelController.save` (so compare-and-set stores still reject
+    conflicting saves), inside `data_store.batch()` when the store provides
+    it. Flushes run every `interval` seconds, as soon as `max_pending`
+    controllers are pending, on `flush` and on `close`; `close` is
+    registered to run at interpreter exit.
+
+    With `instrument` enabled, the queue reports the 'persist' metrics
+    `depth` (gauge), `flush` (latency), `saved` and `coalesced` (counters).
+
+    Init Params:
+        data_store -- Store passed to `DataModelController.save`.
+        interval -- Seconds between background flushes.
+        max_pending -- Pending controller count that triggers a flush.
+        on_error -- Optional callable (ctrl, exception) for failed saves.
+            Controllers rejected with `ConflictError` are dropped from the
+            queue; after any other error they are queued again and retried
+            on the next flush.
+        name -- Metric owner name; defaults to the store class name.
+
+    Public Methods:
+        attach -- Save a controller's changes through this queue.
+        detach -- Stop following a controller.
+        mark -- Queue a controller for the next flush.
+        flush -- Save all pending controllers now.
+        close -- Stop the background thread and flush.
+        stats -- Queue counters.
+    """
+
+    def __init__(self, data_store, interval=1.0, max_pending=1000,
+                 on_error=None, name=None):
+        self._store = data_store
+        self._interval = interval
+        self._max_pending = max_pending
+        self._on_error = on_error
+        self._name = name or data_store.__class__.__name__
+        self._pending = OrderedDict()
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._wake = Event()
+        self._closed = False
+        self._stats = {'marked': 0, 'coalesced': 0, 'saved': 0, 'errors': 0,
+                       'flushes': 0, 'last_flush_seconds': None}
+        self._thread = Thread(target=self._run,
+                              name='WriteBehindQueue(%s)' % self._name)
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    def attach(self, ctrl):
+        """Save the controller's changes through this queue.
+
+        :param ctrl: DataModelController
+        :return: DataModelController -- `ctrl`.
+        """
+        ctrl._write_behind = self
+        return ctrl
+
+    def detach(self, ctrl, flush=True):
+        """Stop following a controller.
+
+        :param ctrl: DataModelController
+        :param flush: bool -- Save the controller now if pending; otherwise
+            its pending changes are dropped from the queue.
+        """
+        ctrl._write_behind = None
+        with self._lock:
+            pending = self._pending.pop((ctrl.__class__, ctrl.uid), None)
+        if pending is not None and flush:
+            self._save([pending])
+
+    def mark(self, ctrl):
+        """Queue a controller for the next flush.
+
+        :param ctrl: DataModelController
+        """
+        key = (ctrl.__class__, ctrl.uid)
+        with self._lock:
+            self._stats['marked'] += 1
+            if key in self._pending:
+                self._stats['coalesced'] += 1
+            else:
+                self._pending[key] = ctrl
+            depth = len(self._pending)
+        if depth >= self._max_pending:
+            self._wake.set()
+        if instrument.ACTIVE:
+            instrument.gauge('persist', self._name, 'depth', depth)
+
+    def flush(self):
+        """Save all pending controllers now.
+
+        :return: int -- Number of controllers saved.
+        """
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        if not pending:
+            return 0
+        return self._save(pending)
+
+    def _save(self, ctrls):
+        with self._flush_lock:
+            start = instrument.clock()
+            batch = getattr(self._store, 'batch', None)
+            if batch is None:
+                saved = self._save_each(ctrls)
+            else:
+                states = [ctrl.model._sync_state() for ctrl in ctrls]
+                try:
+                    with batch():
+                        saved = self._save_each(ctrls)
+                except Exception as e:
+                    # The batch was rolled back as a whole (e.g. a locked
+                    #   database); none of its saves were written.
+                    saved = 0
+                    for ctrl, state in zip(ctrls, states):
+                        ctrl.model._restore_sync_state(state)
+                        self._failed(ctrl, e)
+            elapsed = instrument.clock() - start
+            with self._lock:
+                self._stats['saved'] += saved
+                self._stats['flushes'] += 1
+                self._stats['last_flush_seconds'] = elapsed
+                depth = len(self._pending)
+            if instrument.ACTIVE:
+                instrument.record('persist', self._name, 'flush', start)
+                instrument.incr('persist', self._name, 'saved', saved)
+                instrument.gauge('persist', self._name, 'depth', depth)
+        return saved
+
+    def _save_each(self, ctrls):
+        saved = 0
+        for ctrl in ctrls:
+            try:
+                ctrl.save(self._store)
+            except Exception as e:
+                self._failed(ctrl, e)
+                continue
+            saved += 1
+            # Updated while being saved; save the newer state next flush.
+            if ctrl.model.version != ctrl.model.saved_version:
+                self.mark(ctrl)
+        return saved
+
+    def _failed(self, ctrl, error):
+        """Count a failed save; queue the controller again unless the save
+        conflicted."""
+        with self._lock:
+            self._stats['errors'] += 1
+            if not isinstance(error, ConflictError):
+                self._pending.setdefault((ctrl.__class__, ctrl.uid), ctrl)
+        if self._on_error is not None:
+            try:
+                self._on_error(ctrl, error)
+            except Exception:
+                pass
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            if not self._closed:
+                try:
+                    self.flush()
+                except Exception:
+                    # Keep flushing; failed saves were already re-queued.
+                    with self._lock:
+                        self._stats['errors'] += 1
+
+    def close(self):
+        """Stop the background thread and save everything still pending.
+
+        Controllers whose final save fails stay pending (see `stats`) and are
+        saved by a later `flush` or `close`. Safe to call more than once.
+        """
+        if not self._closed:
+            self._closed = True
+            self._wake.set()
+            self._thread.join()
+        self.flush()
+
+    def stats(self):
+        """Queue counters.
+
+        :return: dict -- 'pending', 'marked', 'coalesced', 'saved', 'errors',
+            'flushes' and 'last_flush_seconds'.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        return stats
@@ -0,0 +1,255 @@
+"""Reference data stores.
+
+Local stand-ins implementing the data-store protocol used by
+`DataModelController` (`uid`, `get_controller`, `set_controller`,
+`delete_controller`, `save`, `delete_model`), plus compare-and-set saves
+(`compare_and_save`) against the `DataModel` version.
+
+.. moduleauthor:: Dave Zimmelman <zimmed@zimmed.io>
+
+Exports:
+    :class MemoryStore -- In-process store.
+    :class SQLiteStore -- SQLite-backed store; a database file may be
+        shared between processes.
+
+Usage:
+    store = SQLiteStore('/tmp/models.db')
+    record = PhoneRecord.new(store, name='Gene Belcher')
+    record.save(store)
+    ...
+    try:
+        record.save(store)
+    except ConflictError as e:
+        # Another process saved first; `e.delta` holds the local changes,
+        #   `e.stored` what is stored now.
+        record.delete_cache(store)
+        record = PhoneRecord.load(store, record.uid)
+"""
+
+from contextlib import contextmanager
+import copy
+from threading import Lock, RLock
+import uuid
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from core.datamodel import DataModel, Rule
+from core.exceptions import ConflictError
+
+
+def _bound_values(model):
+    """Stored values of keys bound 1:1 (without an operation) to a
+    controller attribute, keyed by attribute name."""
+    values = {}
+    for key, rule in model.rules.iteritems():
+        if (isinstance(rule.binding, str) and key != 'uid' and
+                rule.operation == Rule.default_operation):
+            try:
+                values[rule.binding] = model[key]
+            except KeyError:
+                pass
+    return values
+
+
+class _Store(object):
+    """Controller cache and restore logic shared by the reference stores.
+
+    Subclasses implement `_read(cls, uid)`, `_write(cls, model, expected)`
+    and `delete_model(cls, uid)`.
+    """
+
+    def __init__(self):
+        self._controllers = {}
+
+    def uid(self, cls):
+        return uuid.uuid4().hex
+
+    def set_controller(self, cls, ctrl):
+        self._controllers[(cls, ctrl.uid)] = ctrl
+
+    def delete_controller(self, cls, uid):
+        self._controllers.pop((cls, uid), None)
+
+    def get_controller(self, cls, uid):
+        """Get the cached controller, or restore one from the stored model.
+
+        Restored controllers get the stored values of attributes bound 1:1
+        to a model key; other attributes take their `INIT_DEFAULTS`. The
+        model keeps the stored data either way: keys that restoring
+        re-evaluates from defaults (e.g. keys computed by an operation) are
+        put back, so they change only when their attributes are set.
+
+        :raises KeyError if no model is stored under `uid`.
+        """
+        ctrl = self._controllers.get((cls, uid))
+        if ctrl is None:
+            model = self.load_model(cls, uid)
+            data, version = dict(model.iteritems()), model.version
+            ctrl = cls.restore(self, model, **_bound_values(model))
+            ctrl.model._reset(data, version)
+        return ctrl
+
+    def load_model(self, cls, uid):
+        """Load the stored model.
+
+        :return: DataModel -- With `version` set to the stored version.
+        :raises KeyError if no model is stored under `uid`.
+        """
+        record = self._read(cls, uid)
+        if record is None:
+            raise KeyError(uid)
+        data, version = record
+        return DataModel(cls.MODEL_RULES, data=data, version=version)
+
+    def save(self, cls, model):
+        """Save unconditionally.
+
+        :return: int -- The version written.
+        """
+        return self._write(cls, model, None)
+
+    def compare_and_save(self, cls, model, expected):
+        """Save only if the stored version still is `expected`.
+
+        A model that has never been stored is expected at version 0.
+
+        :return: int -- The version written.
+        :raises ConflictError otherwise.
+        """
+        return self._write(cls, model, expected)
+
+    def _conflict(self, model, expected, record):
+        return ConflictError(model['uid'], expected,
+                             record[1] if record else None, model.changes(),
+                             record[0] if record else None)
+
+
+class MemoryStore(_Store):
+    """In-process store. Saved data is deep-copied."""
+
+    def __init__(self):
+        super(MemoryStore, self).__init__()
+        self._lock = Lock()
+        self._models = {}
+
+    def _read(self, cls, uid):
+        with self._lock:
+            record = self._models.get((cls.__name__, uid))
+            return record and (copy.deepcopy(record[0]), record[1])
+
+    def _write(self, cls, model, expected):
+        # Version before data: a concurrent update can only make the data
+        #   newer than the version it is stored under, never older.
+        version = model.version
+        key = (cls.__name__, model['uid'])
+        data = copy.deepcopy(dict(model.iteritems()))
+        with self._lock:
+            record = self._models.get(key)
+            if expected is not None and (
+                    record[1] != expected if record else expected != 0):
+                raise self._conflict(model, expected, record and (
+                    copy.deepcopy(record[0]), record[1]))
+            self._models[key] = (data, version)
+        return version
+
+    def delete_model(self, cls, uid):
+        with self._lock:
+            self._models.pop((cls.__name__, uid), None)
+
+
+class SQLiteStore(_Store):
+    """SQLite-backed store.
+
+    Model data is pickled, so model values must be picklable. Every
+    compare-and-set save is a single conditional statement, so concurrent
+    writers (threads or processes sharing the file) cannot lose updates.
+    Use `batch` to commit many saves at once.
+
+    Init Params:
+        path -- Database file; defaults to a private in-memory database.
+        timeout -- Seconds to wait for another connection's lock.
+    """
+
+    SCHEMA = ('CREATE TABLE IF NOT EXISTS models ('
+              'collection TEXT NOT NULL, uid TEXT NOT NULL, '
+              'version INTEGER NOT NULL, data BLOB NOT NULL, '
+              'PRIMARY KEY (collection, uid))')
+
+    def __init__(self, path=':memory:', timeout=30.0):
+        # Imported here so that `MemoryStore` users do not pay for `sqlite3`.
+        import sqlite3
+        super(SQLiteStore, self).__init__()
+        self._sqlite3 = sqlite3
+        self._lock = RLock()
+        self._db = sqlite3.connect(path, timeout=timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute(self.SCHEMA)
+
+    def _read(self, cls, uid):
+        with self._lock:
+            row = self._db.execute(
+                'SELECT data, version FROM models WHERE collection = ? AND '
+                'uid = ?', (cls.__name__, uid)).fetchone()
+        return row and (pickle.loads(bytes(row[0])), row[1])
+
+    def _write(self, cls, model, expected):
+        # Version before data; see `MemoryStore._write`.
+        version = model.version
+        uid = model['uid']
+        blob = self._sqlite3.Binary(pickle.dumps(dict(model.iteritems()),
+                                                 pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            if expected is None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO models VALUES (?, ?, ?, ?)',
+                    (cls.__name__, uid, version, blob))
+                return version
+            if expected == 0:
+                try:
+                    self._db.execute(
+                        'INSERT INTO models VALUES (?, ?, ?, ?)',
+                        (cls.__name__, uid, version, blob))
+                    return version
+                except self._sqlite3.IntegrityError:
+                    pass
+            updated = self._db.execute(
+                'UPDATE models SET version = ?, data = ? WHERE '
+                'collection = ? AND uid = ? AND version = ?',
+                (version, blob, cls.__name__, uid, expected)).rowcount
+            if not updated:
+                raise self._conflict(model, expected,
+                                     self._read(cls, uid))
+        return version
+
+    @contextmanager
+    def batch(self):
+        """Run the saves made within the block in a single transaction.
+
+        Other threads sharing this store wait until the block exits. If the
+        block or the commit fails, none of its saves are written.
+        """
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                yield self
+                self._db.execute('COMMIT')
+            except BaseException:
+                # A failed COMMIT (e.g. a locked database) leaves the
+                #   transaction open; ROLLBACK fails if there is none.
+                try:
+                    self._db.execute('ROLLBACK')
+                except self._sqlite3.Error:
+                    pass
+                raise
+
+    def delete_model(self, cls, uid):
+        with self._lock:
+            self._db.execute('DELETE FROM models WHERE collection = ? AND '
+                             'uid = ?', (cls.__name__, uid))
+
+    def close(self):
+        self._db.close()